@@ -0,0 +1,46 @@
+"""idea counters
+
+Revision ID: 067a3489c918
+Revises: a215a87a49b5
+Create Date: 2026-10-18 10:03:17.552981
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '067a3489c918'
+down_revision: Union[str, None] = 'a215a87a49b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('ideas', sa.Column('upvotes', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('ideas', sa.Column('downvotes', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('ideas', sa.Column('comments_count', sa.Integer(), server_default='0', nullable=False))
+
+    # keep only the latest vote per (idea, user) before enforcing uniqueness
+    op.execute(
+        "DELETE FROM votes WHERE id NOT IN ("
+        "SELECT keep_id FROM (SELECT MAX(id) AS keep_id FROM votes GROUP BY idea_id, user_id) AS keep)"
+    )
+    op.create_index('uq_votes_idea_user', 'votes', ['idea_id', 'user_id'], unique=True)
+
+    op.execute(
+        "UPDATE ideas SET "
+        "upvotes = (SELECT COUNT(*) FROM votes WHERE votes.idea_id = ideas.id AND votes.type = 'up'), "
+        "downvotes = (SELECT COUNT(*) FROM votes WHERE votes.idea_id = ideas.id AND votes.type = 'down'), "
+        "comments_count = (SELECT COUNT(*) FROM comments WHERE comments.idea_id = ideas.id)"
+    )
+    op.execute("UPDATE ideas SET score = upvotes - downvotes")
+
+
+def downgrade() -> None:
+    op.drop_index('uq_votes_idea_user', table_name='votes')
+    op.drop_column('ideas', 'comments_count')
+    op.drop_column('ideas', 'downvotes')
+    op.drop_column('ideas', 'upvotes')
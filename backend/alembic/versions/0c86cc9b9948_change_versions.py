@@ -0,0 +1,36 @@
+"""change versions
+
+Revision ID: 0c86cc9b9948
+Revises: fe6b90883d2f
+Create Date: 2026-10-18 16:41:27.318604
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c86cc9b9948'
+down_revision: Union[str, None] = 'fe6b90883d2f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('ideas', sa.Column('revision', sa.Integer(), server_default='1', nullable=False))
+    change_versions = op.create_table(
+        'change_versions',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('changed_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('name'),
+    )
+    op.bulk_insert(change_versions, [{'name': 'ideas', 'version': 1, 'changed_at': datetime.utcnow()}])
+
+
+def downgrade() -> None:
+    op.drop_table('change_versions')
+    op.drop_column('ideas', 'revision')
@@ -0,0 +1,60 @@
+"""daily summary
+
+Revision ID: 1220f44976e4
+Revises: 829e91c71d87
+Create Date: 2026-10-18 13:02:37.415902
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1220f44976e4'
+down_revision: Union[str, None] = '829e91c71d87'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# what app.reports.rebuild computed at this revision: ideas by the day they
+# were created, votes and comments by the day they were cast, all under the
+# idea's current category and status (rows without a timestamp count today)
+BACKFILL = sa.text(
+    "INSERT INTO daily_summary (day, category_id, status, ideas, upvotes, downvotes, comments) "
+    "SELECT day, category_id, status, SUM(ideas), SUM(upvotes), SUM(downvotes), SUM(comments) FROM ("
+    " SELECT DATE(COALESCE(i.created_at, :now)) AS day, i.category_id AS category_id, i.status AS status,"
+    "  COUNT(*) AS ideas, 0 AS upvotes, 0 AS downvotes, 0 AS comments"
+    " FROM ideas i GROUP BY DATE(COALESCE(i.created_at, :now)), i.category_id, i.status"
+    " UNION ALL"
+    " SELECT DATE(COALESCE(v.created_at, :now)), i.category_id, i.status, 0,"
+    "  SUM(CASE WHEN v.type = 'up' THEN 1 ELSE 0 END), SUM(CASE WHEN v.type = 'down' THEN 1 ELSE 0 END), 0"
+    " FROM votes v JOIN ideas i ON i.id = v.idea_id WHERE v.type IN ('up', 'down')"
+    " GROUP BY DATE(COALESCE(v.created_at, :now)), i.category_id, i.status"
+    " UNION ALL"
+    " SELECT DATE(COALESCE(c.created_at, :now)), i.category_id, i.status, 0, 0, 0, COUNT(*)"
+    " FROM comments c JOIN ideas i ON i.id = c.idea_id"
+    " GROUP BY DATE(COALESCE(c.created_at, :now)), i.category_id, i.status"
+    ") AS contributions GROUP BY day, category_id, status"
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'daily_summary',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=50), nullable=False),
+        sa.Column('ideas', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('upvotes', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('downvotes', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('comments', sa.Integer(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('day', 'category_id', 'status'),
+    )
+    # backfill from existing ideas, votes and comments
+    op.get_bind().execute(BACKFILL, {'now': datetime.utcnow()})
+
+
+def downgrade() -> None:
+    op.drop_table('daily_summary')
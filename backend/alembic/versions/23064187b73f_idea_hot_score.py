@@ -0,0 +1,55 @@
+"""idea hot score
+
+Revision ID: 23064187b73f
+Revises: 067a3489c918
+Create Date: 2026-10-18 10:41:05.117420
+
+"""
+import math
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '23064187b73f'
+down_revision: Union[str, None] = '067a3489c918'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# app.trending.hot_score as of this revision, with the default settings;
+# app/scripts/recompute_trending.py rewrites the scores for other settings
+EPOCH = datetime(2025, 1, 1)
+DECAY_SECONDS = 45000
+COMMENT_WEIGHT = 0.5
+
+
+def hot_score(upvotes, downvotes, comments_count, created_at):
+    s = (upvotes or 0) - (downvotes or 0) + COMMENT_WEIGHT * (comments_count or 0)
+    order = math.log10(max(abs(s), 1))
+    sign = 1 if s > 0 else -1 if s < 0 else 0
+    age = ((created_at or datetime.utcnow()) - EPOCH).total_seconds()
+    return round(sign * order + age / DECAY_SECONDS, 7)
+
+
+def upgrade() -> None:
+    op.add_column('ideas', sa.Column('hot_score', sa.Float(), server_default='0', nullable=False))
+    op.create_index('ix_ideas_hot_score_id', 'ideas', ['hot_score', 'id'], unique=False)
+
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.text("SELECT id, upvotes, downvotes, comments_count, created_at FROM ideas")
+        .columns(created_at=sa.DateTime())
+    ).all()
+    if rows:
+        bind.execute(
+            sa.text("UPDATE ideas SET hot_score = :hot WHERE id = :id"),
+            [{"id": r.id, "hot": hot_score(r.upvotes, r.downvotes, r.comments_count, r.created_at)} for r in rows],
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ideas_hot_score_id', table_name='ideas')
+    op.drop_column('ideas', 'hot_score')
@@ -0,0 +1,62 @@
+"""user roles
+
+Revision ID: 2896bb73de90
+Revises: 0c86cc9b9948
+Create Date: 2026-10-18 17:52:09.604117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2896bb73de90'
+down_revision: Union[str, None] = '0c86cc9b9948'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+users = sa.table('users', sa.column('id', sa.Integer()), sa.column('roles', sa.JSON()))
+user_roles = sa.table('user_roles', sa.column('user_id', sa.Integer()), sa.column('role', sa.String(50)))
+
+
+def upgrade() -> None:
+    op.create_table('user_roles',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('role', sa.String(length=50), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'role')
+    )
+    op.create_index('ix_user_roles_role_user', 'user_roles', ['role', 'user_id'], unique=False)
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+
+    bind = op.get_bind()
+    rows = []
+    for user_id, roles in bind.execute(sa.select(users.c.id, users.c.roles)):
+        clean = dict.fromkeys(r.strip() for r in roles or [] if isinstance(r, str) and r.strip())
+        rows += [{'user_id': user_id, 'role': r} for r in clean if len(r) <= 50]
+    for i in range(0, len(rows), 5000):
+        bind.execute(user_roles.insert(), rows[i:i + 5000])
+
+    op.drop_column('users', 'roles')
+
+
+def downgrade() -> None:
+    op.add_column('users', sa.Column('roles', sa.JSON(), nullable=True))
+    bind = op.get_bind()
+    roles = {}
+    for user_id, role in bind.execute(sa.select(user_roles.c.user_id, user_roles.c.role).order_by(user_roles.c.user_id, user_roles.c.role)):
+        roles.setdefault(user_id, []).append(role)
+    bind.execute(users.update().values(roles=[]))
+    if roles:
+        bind.execute(
+            users.update().where(users.c.id == sa.bindparam('b_id')).values(roles=sa.bindparam('b_roles')),
+            [{'b_id': user_id, 'b_roles': r} for user_id, r in roles.items()],
+        )
+    with op.batch_alter_table('users') as batch:
+        batch.alter_column('roles', existing_type=sa.JSON(), nullable=False)
+
+    op.drop_index('ix_users_created_at_id', table_name='users')
+    op.drop_index('ix_user_roles_role_user', table_name='user_roles')
+    op.drop_table('user_roles')
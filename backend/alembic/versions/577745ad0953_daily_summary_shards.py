@@ -0,0 +1,63 @@
+"""daily summary shards
+
+Revision ID: 577745ad0953
+Revises: a9395eb794c4
+Create Date: 2026-10-18 21:14:08.530127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '577745ad0953'
+down_revision: Union[str, None] = 'a9395eb794c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MEASURES = 'ideas, upvotes, downvotes, comments'
+
+
+def _create(name: str, sharded: bool) -> None:
+    columns = [
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=50), nullable=False),
+    ]
+    key = ['day', 'category_id', 'status']
+    if sharded:
+        columns.append(sa.Column('shard', sa.Integer(), server_default='0', nullable=False))
+        key.append('shard')
+    op.create_table(
+        name,
+        *columns,
+        sa.Column('ideas', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('upvotes', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('downvotes', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('comments', sa.Integer(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint(*key),
+    )
+
+
+def upgrade() -> None:
+    # the primary key changes, so copy into a new table; existing rows become shard 0
+    _create('daily_summary_sharded', sharded=True)
+    op.execute(
+        f"INSERT INTO daily_summary_sharded (day, category_id, status, shard, {MEASURES}) "
+        f"SELECT day, category_id, status, 0, {MEASURES} FROM daily_summary"
+    )
+    op.drop_table('daily_summary')
+    op.rename_table('daily_summary_sharded', 'daily_summary')
+
+
+def downgrade() -> None:
+    _create('daily_summary_unsharded', sharded=False)
+    op.execute(
+        f"INSERT INTO daily_summary_unsharded (day, category_id, status, {MEASURES}) "
+        "SELECT day, category_id, status, SUM(ideas), SUM(upvotes), SUM(downvotes), SUM(comments) "
+        "FROM daily_summary GROUP BY day, category_id, status"
+    )
+    op.drop_table('daily_summary')
+    op.rename_table('daily_summary_unsharded', 'daily_summary')
@@ -0,0 +1,59 @@
+"""idea fulltext search
+
+Revision ID: 829e91c71d87
+Revises: 23064187b73f
+Create Date: 2026-10-18 11:20:52.804113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '829e91c71d87'
+down_revision: Union[str, None] = '23064187b73f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# the schema as of this revision; app/search.py holds the current definitions
+FULLTEXT_INDEX = 'ft_ideas_title_description'
+SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS ideas_fts USING fts5("
+    "title, description, content='ideas', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS ideas_fts_ai AFTER INSERT ON ideas BEGIN "
+    "INSERT INTO ideas_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS ideas_fts_ad AFTER DELETE ON ideas BEGIN "
+    "INSERT INTO ideas_fts(ideas_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS ideas_fts_au AFTER UPDATE OF title, description ON ideas BEGIN "
+    "INSERT INTO ideas_fts(ideas_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO ideas_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+]
+SQLITE_FTS_REBUILD = "INSERT INTO ideas_fts(ideas_fts) VALUES ('rebuild')"
+SQLITE_FTS_DROP = [
+    "DROP TRIGGER IF EXISTS ideas_fts_ai",
+    "DROP TRIGGER IF EXISTS ideas_fts_ad",
+    "DROP TRIGGER IF EXISTS ideas_fts_au",
+    "DROP TABLE IF EXISTS ideas_fts",
+]
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'mysql':
+        op.create_index(FULLTEXT_INDEX, 'ideas', ['title', 'description'], unique=False, mysql_prefix='FULLTEXT')
+    elif dialect == 'sqlite':
+        for ddl in SQLITE_FTS_DDL:
+            op.execute(ddl)
+        op.execute(SQLITE_FTS_REBUILD)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'mysql':
+        op.drop_index(FULLTEXT_INDEX, table_name='ideas')
+    elif dialect == 'sqlite':
+        # the triggers live on ideas and would outlast the table
+        for ddl in SQLITE_FTS_DROP:
+            op.execute(ddl)
@@ -0,0 +1,32 @@
+"""idea listing indexes
+
+Revision ID: a215a87a49b5
+Revises: fd7fd797a00a
+Create Date: 2026-10-18 09:12:40.218305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a215a87a49b5'
+down_revision: Union[str, None] = 'fd7fd797a00a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_ideas_created_at_id', 'ideas', ['created_at', 'id'], unique=False)
+    op.create_index('ix_ideas_owner_created_at_id', 'ideas', ['owner_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_ideas_category_created_at_id', 'ideas', ['category_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_ideas_status_created_at_id', 'ideas', ['status', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ideas_status_created_at_id', table_name='ideas')
+    op.drop_index('ix_ideas_category_created_at_id', table_name='ideas')
+    op.drop_index('ix_ideas_owner_created_at_id', table_name='ideas')
+    op.drop_index('ix_ideas_created_at_id', table_name='ideas')
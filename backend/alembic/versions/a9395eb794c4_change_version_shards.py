@@ -0,0 +1,57 @@
+"""change version shards
+
+Revision ID: a9395eb794c4
+Revises: 2896bb73de90
+Create Date: 2026-10-18 19:05:41.220913
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9395eb794c4'
+down_revision: Union[str, None] = '2896bb73de90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SHARDS = 16
+
+change_versions = sa.table(
+    'change_versions',
+    sa.column('name', sa.String(50)),
+    sa.column('version', sa.Integer()),
+    sa.column('changed_at', sa.DateTime()),
+)
+
+
+def upgrade() -> None:
+    # the single 'ideas' row becomes shard 0, so the summed version keeps counting up
+    conn = op.get_bind()
+    row = conn.execute(
+        sa.select(change_versions.c.version, change_versions.c.changed_at)
+        .where(change_versions.c.name == 'ideas')
+    ).first()
+    version, changed_at = (row.version, row.changed_at) if row else (0, None)
+    changed_at = changed_at or datetime.utcnow()
+    op.execute(change_versions.delete().where(change_versions.c.name == 'ideas'))
+    op.bulk_insert(change_versions, [
+        {'name': f'ideas:{i}', 'version': version if i == 0 else 0, 'changed_at': changed_at}
+        for i in range(SHARDS)
+    ])
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    shards = change_versions.c.name.like('ideas:%')
+    version, changed_at = conn.execute(
+        sa.select(sa.func.sum(change_versions.c.version), sa.func.max(change_versions.c.changed_at))
+        .where(shards)
+    ).one()
+    op.execute(change_versions.delete().where(shards))
+    op.bulk_insert(change_versions, [
+        {'name': 'ideas', 'version': int(version or 0), 'changed_at': changed_at or datetime.utcnow()},
+    ])
@@ -0,0 +1,62 @@
+"""evaluation scores
+
+Revision ID: c2306b9a8d25
+Revises: dbaf1ad21c74
+Create Date: 2026-10-18 14:26:51.640317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2306b9a8d25'
+down_revision: Union[str, None] = 'dbaf1ad21c74'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('ideas', sa.Column('eval_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('ideas', sa.Column('eval_total', sa.Float(), server_default='0', nullable=False))
+    op.add_column('ideas', sa.Column('eval_score', sa.Float(), server_default='0', nullable=False))
+    op.create_index('ix_ideas_eval_score_id', 'ideas', ['eval_score', 'id'], unique=False)
+
+    # nothing ever wrote evaluations.criteria, so there is no free-form data to carry over
+    with op.batch_alter_table('evaluations') as batch:
+        batch.drop_column('criteria')
+    op.create_index('uq_evaluations_idea_user', 'evaluations', ['idea_id', 'user_id'], unique=True)
+
+    op.create_table(
+        'evaluation_scores',
+        sa.Column('idea_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('criterion', sa.String(length=50), nullable=False),
+        sa.Column('score', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['idea_id'], ['ideas.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('idea_id', 'user_id', 'criterion'),
+    )
+    op.create_table(
+        'idea_criterion_scores',
+        sa.Column('idea_id', sa.Integer(), nullable=False),
+        sa.Column('criterion', sa.String(length=50), nullable=False),
+        sa.Column('count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('total', sa.Integer(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['idea_id'], ['ideas.id']),
+        sa.PrimaryKeyConstraint('idea_id', 'criterion'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('idea_criterion_scores')
+    op.drop_table('evaluation_scores')
+    op.drop_index('uq_evaluations_idea_user', table_name='evaluations')
+    with op.batch_alter_table('evaluations') as batch:
+        batch.add_column(sa.Column('criteria', sa.String(length=100), server_default='', nullable=False))
+    op.drop_index('ix_ideas_eval_score_id', table_name='ideas')
+    op.drop_column('ideas', 'eval_score')
+    op.drop_column('ideas', 'eval_total')
+    op.drop_column('ideas', 'eval_count')
@@ -0,0 +1,26 @@
+"""idea version
+
+Revision ID: dbaf1ad21c74
+Revises: 1220f44976e4
+Create Date: 2026-10-18 13:48:10.226093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'dbaf1ad21c74'
+down_revision: Union[str, None] = '1220f44976e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('ideas', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('ideas', 'version')
@@ -0,0 +1,26 @@
+"""comment thread index
+
+Revision ID: fe6b90883d2f
+Revises: c2306b9a8d25
+Create Date: 2026-10-18 15:03:12.508841
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fe6b90883d2f'
+down_revision: Union[str, None] = 'c2306b9a8d25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_comments_idea_created_at_id', 'comments', ['idea_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_comments_idea_created_at_id', table_name='comments')
@@ -0,0 +1,71 @@
+# backend/app/category_cache.py
+# In-process cache of the category catalogue.
+#
+# Categories change only through the admin endpoints, which call
+# invalidate() after committing; that bumps the version and the next reader
+# reloads. Other workers don't see the bump, so entries also expire after
+# CATEGORY_CACHE_TTL_SECONDS, and a lookup for an id we don't know forces a
+# reload.
+import hashlib
+import json
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import settings
+
+# don't reload more often than this just because an id is unknown
+MISS_RELOAD_INTERVAL = 1.0
+
+
+class CategoryCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version = 0
+        self._loaded_version = -1
+        self._loaded_at = 0.0
+        self._items: List[dict] = []
+        self._names: Dict[int, str] = {}
+        self._etag = ""
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.version += 1
+
+    def _fresh(self) -> bool:
+        return self._loaded_version == self.version and \
+            time.monotonic() - self._loaded_at < settings.CATEGORY_CACHE_TTL_SECONDS
+
+    def _load(self, db: Session) -> None:
+        version = self.version
+        rows = db.execute(select(models.Category.id, models.Category.name).order_by(models.Category.name.asc())).all()
+        items = [{"id": int(r.id), "name": r.name} for r in rows]
+        etag = '"%s"' % hashlib.sha1(json.dumps(items, separators=(",", ":")).encode()).hexdigest()[:16]
+        with self._lock:
+            self._items = items
+            self._names = {i["id"]: i["name"] for i in items}
+            self._etag = etag
+            self._loaded_version = version
+            self._loaded_at = time.monotonic()
+
+    def snapshot(self, db: Session) -> Tuple[List[dict], str]:
+        """(categories ordered by name, ETag for that list)."""
+        if not self._fresh():
+            self._load(db)
+        return self._items, self._etag
+
+    def names(self, db: Session, ids: Iterable[Optional[int]] = ()) -> Dict[int, str]:
+        """id -> name map; reloads once if any of `ids` is unknown."""
+        if not self._fresh():
+            self._load(db)
+        elif any(i is not None and i not in self._names for i in ids) and \
+                time.monotonic() - self._loaded_at > MISS_RELOAD_INTERVAL:
+            self._load(db)
+        return self._names
+
+
+category_cache = CategoryCache()
@@ -0,0 +1,110 @@
+# backend/app/changes.py
+# Change versions behind the ETags of the idea read endpoints.
+#
+# ideas.revision goes up by one in every UPDATE that changes what an idea
+# renders as (votes, comments, status, evaluations). The collection's version
+# is spread over IDEAS_SHARDS rows of change_versions: bump_ideas() increments
+# one of them, picked at random, in the writer's transaction, and the version
+# is their sum. One row for everything would be locked by every write on the
+# site until its commit; with shards two writers only meet on the same row
+# by chance. Callers bump as the last statement before commit, so the shard
+# lock is always taken after every other lock of the transaction and held
+# for as short as possible. Readers sum the shards (a primary-key lookup)
+# before running the listing query and answer If-None-Match with a 304 when
+# nothing moved.
+import random
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import models
+
+if TYPE_CHECKING:  # the async extension only loads with ASYNC_DB
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+IDEAS = "ideas"
+IDEAS_SHARDS = 16  # the migration seeds ideas:0 .. ideas:15
+IDEAS_SHARD_NAMES = [f"{IDEAS}:{i}" for i in range(IDEAS_SHARDS)]
+
+
+def bump_ideas(db: Session) -> None:
+    """Mark the idea collection changed; call in the writing transaction, as the last statement before commit."""
+    bump, create = _bump_ideas_stmts()
+    if db.execute(bump).rowcount:
+        return
+    # databases built with create_all rather than the migrations start without the rows
+    try:
+        with db.begin_nested():
+            db.execute(create)
+    except IntegrityError:
+        # another writer created it first
+        db.execute(bump)
+
+
+async def bump_ideas_async(db: "AsyncSession") -> None:
+    bump, create = _bump_ideas_stmts()
+    if (await db.execute(bump)).rowcount:
+        return
+    try:
+        async with db.begin_nested():
+            await db.execute(create)
+    except IntegrityError:
+        await db.execute(bump)
+
+
+def _bump_ideas_stmts():
+    """(increment, insert) for one shard picked at random."""
+    table = models.ChangeVersion.__table__
+    name = random.choice(IDEAS_SHARD_NAMES)
+    now = datetime.utcnow()
+    return (
+        update(table).where(table.c.name == name).values(version=table.c.version + 1, changed_at=now),
+        insert(table).values(name=name, version=1, changed_at=now),
+    )
+
+
+def _ideas_version_stmt():
+    return (
+        select(func.sum(models.ChangeVersion.version), func.max(models.ChangeVersion.changed_at))
+        .where(models.ChangeVersion.name.in_(IDEAS_SHARD_NAMES))
+    )
+
+
+def ideas_version(db: Session) -> Tuple[int, Optional[datetime]]:
+    version, changed_at = db.execute(_ideas_version_stmt()).one()
+    return int(version or 0), changed_at
+
+
+async def ideas_version_async(db: "AsyncSession") -> Tuple[int, Optional[datetime]]:
+    version, changed_at = (await db.execute(_ideas_version_stmt())).one()
+    return int(version or 0), changed_at
+
+
+def _idea_revision_stmt(idea_id: int):
+    return select(models.Idea.revision, models.Idea.updated_at).where(models.Idea.id == idea_id)
+
+
+def idea_revision(db: Session, idea_id: int) -> Optional[Tuple[int, Optional[datetime]]]:
+    """(revision, updated_at) of one idea, or None when it does not exist."""
+    row = db.execute(_idea_revision_stmt(idea_id)).first()
+    return (row.revision, row.updated_at) if row else None
+
+
+async def idea_revision_async(db: "AsyncSession", idea_id: int) -> Optional[Tuple[int, Optional[datetime]]]:
+    row = (await db.execute(_idea_revision_stmt(idea_id))).first()
+    return (row.revision, row.updated_at) if row else None
+
+
+def make_etag(*parts) -> str:
+    # weak: the compressed and identity bodies are equivalent, not byte-identical
+    return 'W/"%s"' % "-".join(str(p).strip('"') for p in parts)
+
+
+def http_date(value: Optional[datetime]) -> Optional[str]:
+    if value is None:
+        return None
+    return format_datetime(value.replace(tzinfo=timezone.utc), usegmt=True)
@@ -3,11 +3,52 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str="mysql+pymyslql://igniteuser:ignitepassword@db:3306/ignitedb"
+    ASYNC_DB:bool=False #serve the idea reads, idea creation, comments and votes from an async engine
+    ASYNC_DATABASE_URL:str="" #defaults to DATABASE_URL with the async driver swapped in
+    DB_POOL_SIZE:int=5 #per engine, per worker process
+    DB_MAX_OVERFLOW:int=10
+    DB_POOL_TIMEOUT:float=30.0
+    DB_POOL_RECYCLE:int=1800 #keep below MySQL wait_timeout
+    DB_POOL_PRE_PING:bool=False #recycle + disconnect handling instead of a ping per checkout
+    DB_POOL_PREFILL:int=5 #connections opened during startup warm-up, at most DB_POOL_SIZE; 0 skips
+    DB_DEADLOCK_RETRIES:int=3 #times a vote/comment/idea write is re-run after losing a deadlock or lock wait
+    DB_CREATE_ALL:bool=False #dev/test only: create missing tables at startup; otherwise run alembic upgrade head
     JWT_SECRET:str="SECRET_KEY"
     JWT_ALGORITHM:str="HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES:int=1440 #basically 1 day 60*24
+    TRENDING_DECAY_SECONDS:int=45000 #10x the votes to beat an idea this much newer
+    TRENDING_COMMENT_WEIGHT:float=0.5
+    RELATED_VECTOR_DIM:int=512
+    RELATED_INDEX_MAX_AGE_SECONDS:int=3600
+    CATEGORY_CACHE_TTL_SECONDS:int=60
+    PRINCIPAL_CACHE_SIZE:int=10000
+    PRINCIPAL_CACHE_TTL_SECONDS:int=60
+    BCRYPT_ROUNDS:int=12
+    SLOW_REQUEST_SECONDS:float=1.0 #0 disables slow request logging
+    SLOW_REQUEST_LOG_SQL:bool=True
+    PASSWORD_HASH_WORKERS:int=2
+    PASSWORD_HASH_QUEUE_SIZE:int=64
+    EVENTS_BROKER:str="app.events:LocalBroker" #module:Class implementing app.events.Broker
+    EVENTS_QUEUE_SIZE:int=100 #per SSE client; the oldest events are dropped past this
+    EVENTS_HEARTBEAT_SECONDS:float=15.0
+    VOTE_WRITE_BEHIND:bool=False #buffer votes in-process and write them in batches (app/vote_buffer.py)
+    VOTE_FLUSH_INTERVAL_SECONDS:float=0.5
+    VOTE_FLUSH_BATCH_SIZE:int=1000 #votes per flush transaction
+    VOTE_BUFFER_SIZE:int=10000 #distinct (idea, user) votes waiting; 503 past this
+    COMPRESSION_MIN_BYTES:int=1024 #JSON bodies this big or bigger are gzip/brotli compressed; 0 disables
 
     class Config:
         env_file = ".env"
 
+    @property
+    def async_database_url(self) -> str:
+        if self.ASYNC_DATABASE_URL:
+            return self.ASYNC_DATABASE_URL
+        url = self.DATABASE_URL
+        for sync_prefix, async_prefix in (("mysql+pymysql://", "mysql+aiomysql://"), ("mysql://", "mysql+aiomysql://"),
+                                          ("sqlite://", "sqlite+aiosqlite://")):
+            if url.startswith(sync_prefix):
+                return async_prefix + url[len(sync_prefix):]
+        return url
+
 settings = Settings()
@@ -0,0 +1,193 @@
+# backend/app/counters.py
+# Denormalized vote/comment counters kept on the ideas row.
+#
+# The *_async variants run the same statements on an AsyncSession for the
+# async write handlers (routers/ideas_async.py).
+from datetime import datetime
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app import changes, models
+from app.trending import hot_score, recompute_hot_scores
+
+if TYPE_CHECKING:  # the async extension only loads with ASYNC_DB
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def upsert_vote(db: Session, idea_id: int, user_id: int, vote_type: str) -> None:
+    """Insert or overwrite a user's vote in a single statement (relies on uq_votes_idea_user)."""
+    upsert_votes(db, [(idea_id, user_id, vote_type)])
+
+
+def upsert_votes(db: Session, votes: List[Tuple[int, int, str]]) -> None:
+    """upsert_vote for many (idea_id, user_id, type) at once, as one executemany where the dialect allows."""
+    rows = _vote_rows(votes)
+    if not rows:
+        return
+    stmt = _upsert_votes_stmt(db.get_bind().dialect.name)
+    if stmt is None:
+        for values in rows:
+            existing = db.execute(
+                select(models.Vote).where(models.Vote.idea_id == values["idea_id"], models.Vote.user_id == values["user_id"])
+            ).scalar_one_or_none()
+            if existing:
+                existing.type = values["type"]
+            else:
+                db.add(models.Vote(**values))
+        db.flush()
+        return
+    db.execute(stmt, rows)
+
+
+async def upsert_vote_async(db: "AsyncSession", idea_id: int, user_id: int, vote_type: str) -> None:
+    rows = _vote_rows([(idea_id, user_id, vote_type)])
+    stmt = _upsert_votes_stmt(db.get_bind().dialect.name)
+    if stmt is None:
+        await db.run_sync(upsert_votes, [(idea_id, user_id, vote_type)])
+        return
+    await db.execute(stmt, rows)
+
+
+def _vote_rows(votes: List[Tuple[int, int, str]]) -> List[dict]:
+    now = datetime.utcnow()
+    return [{"idea_id": i, "user_id": u, "type": t, "created_at": now} for i, u, t in votes]
+
+
+def _upsert_votes_stmt(dialect: str):
+    """The dialect's insert-or-overwrite for votes, or None where it has none."""
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        stmt = mysql_insert(models.Vote.__table__)
+        return stmt.on_duplicate_key_update(type=stmt.inserted.type)
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        stmt = sqlite_insert(models.Vote.__table__)
+        return stmt.on_conflict_do_update(index_elements=["idea_id", "user_id"], set_={"type": stmt.excluded.type})
+    return None
+
+
+def vote_deltas(previous: Optional[str], new: str) -> Tuple[int, int]:
+    """(upvotes delta, downvotes delta) for changing a user's vote from `previous` to `new`."""
+    up = (new == "up") - (previous == "up")
+    down = (new == "down") - (previous == "down")
+    return up, down
+
+
+def lock_idea_counters(db: Session, idea_id: int):
+    """Read an idea's counters with a row lock so concurrent writers apply deltas one at a time."""
+    return db.execute(_lock_idea_counters_stmt(idea_id)).first()
+
+
+async def lock_idea_counters_async(db: "AsyncSession", idea_id: int):
+    return (await db.execute(_lock_idea_counters_stmt(idea_id))).first()
+
+
+def _lock_idea_counters_stmt(idea_id: int):
+    return (
+        select(
+            models.Idea.id, models.Idea.upvotes, models.Idea.downvotes,
+            models.Idea.comments_count, models.Idea.created_at,
+            models.Idea.category_id, models.Idea.status,
+        )
+        .where(models.Idea.id == idea_id)
+        .with_for_update()
+    )
+
+
+def _write_counters_stmt(idea, upvotes: int, downvotes: int, comments_count: int):
+    return (
+        update(models.Idea)
+        .where(models.Idea.id == idea.id)
+        .values(
+            upvotes=upvotes,
+            downvotes=downvotes,
+            comments_count=comments_count,
+            score=float(upvotes - downvotes),
+            hot_score=hot_score(upvotes, downvotes, comments_count, idea.created_at),
+            revision=models.Idea.revision + 1,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def apply_vote_deltas(db: Session, idea, up: int, down: int) -> None:
+    """`idea` is the row returned by lock_idea_counters."""
+    if not up and not down:
+        return
+    db.execute(_write_counters_stmt(idea, idea.upvotes + up, idea.downvotes + down, idea.comments_count))
+
+
+async def apply_vote_deltas_async(db: "AsyncSession", idea, up: int, down: int) -> None:
+    if not up and not down:
+        return
+    await db.execute(_write_counters_stmt(idea, idea.upvotes + up, idea.downvotes + down, idea.comments_count))
+
+
+def increment_comments(db: Session, idea_id: int, delta: int = 1):
+    """Bump comments_count; returns the locked idea row, or None when the idea does not exist."""
+    idea = lock_idea_counters(db, idea_id)
+    if not idea:
+        return None
+    db.execute(_write_counters_stmt(idea, idea.upvotes, idea.downvotes, idea.comments_count + delta))
+    return idea
+
+
+async def increment_comments_async(db: "AsyncSession", idea_id: int, delta: int = 1):
+    idea = await lock_idea_counters_async(db, idea_id)
+    if not idea:
+        return None
+    await db.execute(_write_counters_stmt(idea, idea.upvotes, idea.downvotes, idea.comments_count + delta))
+    return idea
+
+
+def _actual_counts():
+    up = (
+        select(func.count(models.Vote.id))
+        .where(models.Vote.idea_id == models.Idea.id, models.Vote.type == "up")
+        .scalar_subquery()
+    )
+    down = (
+        select(func.count(models.Vote.id))
+        .where(models.Vote.idea_id == models.Idea.id, models.Vote.type == "down")
+        .scalar_subquery()
+    )
+    comments = (
+        select(func.count(models.Comment.id))
+        .where(models.Comment.idea_id == models.Idea.id)
+        .scalar_subquery()
+    )
+    return up, down, comments
+
+
+def find_counter_drift(db: Session) -> List[dict]:
+    """Ideas whose stored counters disagree with the votes/comments tables."""
+    up, down, comments = _actual_counts()
+    rows = db.execute(
+        select(
+            models.Idea.id,
+            models.Idea.upvotes, up.label("actual_upvotes"),
+            models.Idea.downvotes, down.label("actual_downvotes"),
+            models.Idea.comments_count, comments.label("actual_comments_count"),
+        ).where(or_(models.Idea.upvotes != up, models.Idea.downvotes != down, models.Idea.comments_count != comments))
+    ).all()
+    return [dict(r._mapping) for r in rows]
+
+
+def repair_counters(db: Session) -> List[dict]:
+    """Recompute drifted counters from the source tables; returns the drift that was fixed."""
+    drift = find_counter_drift(db)
+    if drift:
+        up, down, comments = _actual_counts()
+        db.execute(
+            update(models.Idea)
+            .where(models.Idea.id.in_([d["id"] for d in drift]))
+            .values(upvotes=up, downvotes=down, comments_count=comments, score=up - down,
+                    revision=models.Idea.revision + 1)
+            .execution_options(synchronize_session=False)
+        )
+        changes.bump_ideas(db)
+        db.commit()
+        recompute_hot_scores(db, [d["id"] for d in drift])
+    return drift
@@ -1,11 +1,34 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.core.config import settings
+from app.metrics import instrument_engine
+from app.pool_stats import async_pool_stats, attach, instrumented_pool_class, sync_pool_stats
+
+def _pool_options(url: str, base_pool) -> dict:
+    """Pool sizing from Settings; in-memory SQLite keeps its single-connection pool."""
+    u = make_url(url)
+    if u.get_backend_name() == "sqlite" and u.database in (None, "", ":memory:"):
+        return {}
+    stats = async_pool_stats if base_pool is AsyncAdaptedQueuePool else sync_pool_stats
+    return {
+        "poolclass": instrumented_pool_class(base_pool, stats),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        # recycle before MySQL's wait_timeout drops idle connections; a connection
+        # that dies anyway is caught on first use and the pool is invalidated
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
 
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
-    future=True)
+    future=True,
+    **_pool_options(settings.DATABASE_URL, QueuePool))
+attach(engine, sync_pool_stats)
+instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
 Base = declarative_base()
 
@@ -14,4 +37,21 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Optional async stack (aiomysql / aiosqlite), only built when ASYNC_DB is set.
+async_engine = None
+AsyncSessionLocal = None
+if settings.ASYNC_DB:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(
+        settings.async_database_url,
+        **_pool_options(settings.async_database_url, AsyncAdaptedQueuePool))
+    attach(async_engine.sync_engine, async_pool_stats)
+    instrument_engine(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
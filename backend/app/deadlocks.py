@@ -0,0 +1,69 @@
+# backend/app/deadlocks.py
+# Re-running write transactions that lost a deadlock.
+#
+# The vote, comment and idea writers lock an idea row, upsert the vote or
+# summary rows and bump a change-version shard. MySQL can still pick one of
+# two such transactions as a deadlock victim (or give up on a lock wait), and
+# SQLite answers a second writer with "database is locked". Either way the
+# transaction was rolled back as a whole and is safe to run again from the
+# start, which is what run_transaction() does, a few times with a short
+# random backoff, before letting the error through.
+import asyncio
+import random
+import time
+from typing import TYPE_CHECKING, Awaitable, Callable, TypeVar
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+if TYPE_CHECKING:  # the async extension only loads with ASYNC_DB
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+T = TypeVar("T")
+
+# ER_LOCK_DEADLOCK, ER_LOCK_WAIT_TIMEOUT
+MYSQL_RETRYABLE = (1213, 1205)
+
+
+def is_retryable(exc: DBAPIError) -> bool:
+    """True for a deadlock or lock timeout, after which the whole transaction can be re-run."""
+    orig = exc.orig
+    args = getattr(orig, "args", ())
+    if args and args[0] in MYSQL_RETRYABLE:
+        return True
+    return "database is locked" in str(orig)
+
+
+def backoff(attempt: int) -> float:
+    """Seconds to wait before re-running after the `attempt`-th failure (0-based)."""
+    return random.uniform(0, 0.01 * 2 ** attempt)
+
+
+def run_transaction(db: Session, work: Callable[[], T]) -> T:
+    """Call `work()`, which ends by committing, again after a rollback each time it loses a deadlock.
+
+    `work` must redo everything the transaction does, reads included; what it
+    returns is passed through.
+    """
+    for attempt in range(settings.DB_DEADLOCK_RETRIES + 1):
+        try:
+            return work()
+        except DBAPIError as e:
+            db.rollback()
+            if attempt == settings.DB_DEADLOCK_RETRIES or not is_retryable(e):
+                raise
+        time.sleep(backoff(attempt))
+
+
+async def run_transaction_async(db: "AsyncSession", work: Callable[[], Awaitable[T]]) -> T:
+    """run_transaction for an AsyncSession; `work` is a coroutine function."""
+    for attempt in range(settings.DB_DEADLOCK_RETRIES + 1):
+        try:
+            return await work()
+        except DBAPIError as e:
+            await db.rollback()
+            if attempt == settings.DB_DEADLOCK_RETRIES or not is_retryable(e):
+                raise
+        await asyncio.sleep(backoff(attempt))
@@ -5,12 +5,17 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.core.security import decode_token
 from app import models
+from app.principal_cache import Principal, principal_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> models.User:
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> Principal:
     if not token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    # a cached token was decoded and verified when it was put, and expires with its exp
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
     payload = decode_token(token)
     if not payload:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
@@ -24,10 +29,12 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     user = db.get(models.User, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    return user
+    principal = Principal.from_user(user)
+    principal_cache.put(token, principal, payload.get("exp"))
+    return principal
 
 def require_roles(*roles):
-    def role_checker(current_user: models.User = Depends(get_current_user)):
+    def role_checker(current_user: Principal = Depends(get_current_user)):
         user_roles = current_user.roles or []
         if not any(r in user_roles for r in roles):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient role")
@@ -0,0 +1,216 @@
+# backend/app/evaluations.py
+# Evaluator scoring with running per-idea aggregates.
+#
+# Each evaluation stores one row per criterion in evaluation_scores. The
+# submission also applies deltas to idea_criterion_scores (count and total
+# per criterion) and to ideas.eval_count/eval_total/eval_score, so the work
+# per submission depends only on its number of criteria: nothing rescans
+# evaluations, and ranking by eval_score is an index walk.
+from datetime import datetime
+from typing import Dict, List, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import bindparam, delete, insert, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app import changes, models
+from app.principal_cache import Principal
+
+SCORE_MIN = 0
+SCORE_MAX = 10
+MAX_CRITERIA = 20
+MAX_BATCH = 200
+CRITERION_MAX = 50
+
+Submission = Tuple[int, Dict[str, int]]  # (idea id, criterion -> score)
+
+
+def _clean(scores: Dict[str, int]) -> Dict[str, int]:
+    if not scores:
+        raise HTTPException(status_code=400, detail="criteria_scores must not be empty")
+    if len(scores) > MAX_CRITERIA:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_CRITERIA} criteria per evaluation")
+    out = {}
+    for name, score in scores.items():
+        criterion = " ".join(str(name).split())
+        if not criterion or len(criterion) > CRITERION_MAX:
+            raise HTTPException(status_code=400, detail=f"Criterion names must be 1-{CRITERION_MAX} characters")
+        if criterion in out:
+            raise HTTPException(status_code=400, detail=f"Duplicate criterion {criterion!r}")
+        if not SCORE_MIN <= score <= SCORE_MAX:
+            raise HTTPException(status_code=400, detail=f"Scores must be between {SCORE_MIN} and {SCORE_MAX}")
+        out[criterion] = score
+    return out
+
+
+def _mean(scores: Dict[str, int]) -> float:
+    return sum(scores.values()) / len(scores)
+
+
+def _bump_criteria(db: Session, deltas: Dict[Tuple[int, str], List[int]]) -> None:
+    """Add (count, total) deltas to idea_criterion_scores in one executemany upsert."""
+    rows = [
+        {"idea_id": idea_id, "criterion": criterion, "count": count, "total": total}
+        for (idea_id, criterion), (count, total) in deltas.items()
+        if count or total
+    ]
+    if not rows:
+        return
+    table = models.IdeaCriterionScore.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        stmt = mysql_insert(table)
+        stmt = stmt.on_duplicate_key_update(count=table.c.count + stmt.inserted.count,
+                                            total=table.c.total + stmt.inserted.total)
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        stmt = sqlite_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["idea_id", "criterion"],
+            set_={"count": table.c.count + stmt.excluded.count, "total": table.c.total + stmt.excluded.total},
+        )
+    else:
+        for row in rows:
+            existing = db.get(models.IdeaCriterionScore, (row["idea_id"], row["criterion"]))
+            if existing is None:
+                db.add(models.IdeaCriterionScore(**row))
+            else:
+                existing.count += row["count"]
+                existing.total += row["total"]
+        db.flush()
+        return
+    db.execute(stmt, rows)
+
+
+def submit(db: Session, user: Principal, submissions: Sequence[Submission]) -> List[dict]:
+    """Store `user`'s evaluations (replacing earlier ones) in one transaction; returns one result per submission."""
+    if not submissions:
+        return []
+    if len(submissions) > MAX_BATCH:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH} evaluations per request")
+    cleaned = {}
+    for idea_id, scores in submissions:
+        if idea_id in cleaned:
+            raise HTTPException(status_code=400, detail="Each idea may appear only once per request")
+        cleaned[idea_id] = _clean(scores)
+    ids = list(cleaned)
+
+    Idea, Evaluation, EvaluationScore = models.Idea, models.Evaluation, models.EvaluationScore
+    ideas = {
+        r.id: r
+        for r in db.execute(
+            select(Idea.id, Idea.eval_count, Idea.eval_total).where(Idea.id.in_(ids)).with_for_update()
+        )
+    }
+    missing = [i for i in ids if i not in ideas]
+    if missing:
+        db.rollback()
+        raise HTTPException(status_code=404, detail={"message": "Idea not found", "ids": missing})
+
+    previous_totals = dict(db.execute(
+        select(Evaluation.idea_id, Evaluation.total_score)
+        .where(Evaluation.user_id == user.id, Evaluation.idea_id.in_(ids))
+    ).all())
+    previous_scores: Dict[int, Dict[str, int]] = {}
+    if previous_totals:
+        for idea_id, criterion, score in db.execute(
+            select(EvaluationScore.idea_id, EvaluationScore.criterion, EvaluationScore.score)
+            .where(EvaluationScore.user_id == user.id, EvaluationScore.idea_id.in_(list(previous_totals)))
+        ):
+            previous_scores.setdefault(idea_id, {})[criterion] = score
+
+    now = datetime.utcnow()
+    criteria_deltas: Dict[Tuple[int, str], List[int]] = {}
+    idea_rows, new_evals, changed_evals = [], [], []
+    for idea_id, scores in cleaned.items():
+        total = _mean(scores)
+        count, eval_total = ideas[idea_id].eval_count, ideas[idea_id].eval_total
+        for criterion, score in previous_scores.get(idea_id, {}).items():
+            d = criteria_deltas.setdefault((idea_id, criterion), [0, 0])
+            d[0] -= 1
+            d[1] -= score
+        for criterion, score in scores.items():
+            d = criteria_deltas.setdefault((idea_id, criterion), [0, 0])
+            d[0] += 1
+            d[1] += score
+        if idea_id in previous_totals:
+            eval_total += total - previous_totals[idea_id]
+            changed_evals.append({"b_idea": idea_id, "b_total": total, "b_at": now})
+        else:
+            count += 1
+            eval_total += total
+            new_evals.append({"idea_id": idea_id, "user_id": user.id, "total_score": total, "created_at": now})
+        idea_rows.append({
+            "b_id": idea_id, "b_count": count, "b_total": eval_total,
+            "b_score": eval_total / count if count else 0.0,
+        })
+
+    try:
+        if new_evals:
+            db.execute(insert(Evaluation), new_evals)
+        if changed_evals:
+            evaluations = Evaluation.__table__
+            db.execute(
+                update(evaluations)
+                .where(evaluations.c.idea_id == bindparam("b_idea"), evaluations.c.user_id == user.id)
+                .values(total_score=bindparam("b_total"), created_at=bindparam("b_at")),
+                changed_evals,
+            )
+            db.execute(
+                delete(EvaluationScore)
+                .where(EvaluationScore.user_id == user.id, EvaluationScore.idea_id.in_(list(previous_totals)))
+                .execution_options(synchronize_session=False)
+            )
+        db.execute(insert(EvaluationScore), [
+            {"idea_id": idea_id, "user_id": user.id, "criterion": criterion, "score": score}
+            for idea_id, scores in cleaned.items() for criterion, score in scores.items()
+        ])
+        _bump_criteria(db, criteria_deltas)
+        ideas_table = Idea.__table__
+        db.execute(
+            update(ideas_table)
+            .where(ideas_table.c.id == bindparam("b_id"))
+            .values(eval_count=bindparam("b_count"), eval_total=bindparam("b_total"), eval_score=bindparam("b_score"),
+                    revision=ideas_table.c.revision + 1),
+            idea_rows,
+        )
+        # a criterion that dropped out of every evaluation of an idea leaves nothing behind
+        emptied = [key for key, (count, _) in criteria_deltas.items() if count < 0]
+        if emptied:
+            db.execute(
+                delete(models.IdeaCriterionScore)
+                .where(tuple_(models.IdeaCriterionScore.idea_id, models.IdeaCriterionScore.criterion).in_(emptied))
+                .where(models.IdeaCriterionScore.count == 0)
+                .execution_options(synchronize_session=False)
+            )
+        changes.bump_ideas(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    aggregates = idea_aggregates(db, ids)
+    return [
+        {"idea_id": idea_id, "total_score": round(_mean(scores), 4), "criteria_scores": scores,
+         "idea": aggregates[idea_id]}
+        for idea_id, scores in cleaned.items()
+    ]
+
+
+def idea_aggregates(db: Session, idea_ids: Sequence[int]) -> Dict[int, dict]:
+    """Running aggregates for each idea: overall count/mean plus count/sum/mean per criterion."""
+    out = {
+        r.id: {"count": r.eval_count, "mean": round(r.eval_score, 4), "criteria": {}}
+        for r in db.execute(
+            select(models.Idea.id, models.Idea.eval_count, models.Idea.eval_score).where(models.Idea.id.in_(idea_ids))
+        )
+    }
+    S = models.IdeaCriterionScore
+    for idea_id, criterion, count, total in db.execute(
+        select(S.idea_id, S.criterion, S.count, S.total).where(S.idea_id.in_(idea_ids)).order_by(S.idea_id, S.criterion)
+    ):
+        out[idea_id]["criteria"][criterion] = {
+            "count": count, "sum": total, "mean": round(total / count, 4) if count else 0.0,
+        }
+    return out
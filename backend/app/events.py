@@ -0,0 +1,133 @@
+# backend/app/events.py
+# Live updates: a per-worker pub/sub hub behind the SSE endpoints.
+#
+# Request handlers publish after their commit; the hub hands each message to
+# the configured Broker, and the broker delivers it back to the hub of every
+# worker, which fans it out to that worker's SSE clients. LocalBroker is the
+# in-process stand-in (one worker, or tests); a cross-worker broker (Redis
+# pub/sub, Postgres LISTEN/NOTIFY, ...) implements the same three methods and
+# is selected with EVENTS_BROKER.
+import asyncio
+import importlib
+import itertools
+import json
+import threading
+from typing import Callable, Dict, Optional, Set
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+
+GLOBAL_CHANNEL = "ideas"
+
+
+def idea_channel(idea_id: int) -> str:
+    return f"idea:{idea_id}"
+
+
+class Broker:
+    """Transport between workers.
+
+    publish() may be called from any thread; the broker must call the
+    `deliver` callback given to start() once per message, on every worker
+    (the publishing one included), from any thread.
+    """
+
+    def start(self, deliver: Callable[[str, dict], None]) -> None:
+        raise NotImplementedError
+
+    def publish(self, channel: str, message: dict) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class LocalBroker(Broker):
+    def start(self, deliver: Callable[[str, dict], None]) -> None:
+        self._deliver = deliver
+
+    def publish(self, channel: str, message: dict) -> None:
+        self._deliver(channel, message)
+
+
+class Subscription:
+    """One SSE client's bounded queue, owned by the event loop serving it."""
+
+    def __init__(self, channel: str, maxsize: int):
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def _put(self, message: dict) -> None:
+        # a slow client loses its oldest events rather than stalling everyone
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+
+    def offer(self, message: dict) -> None:
+        self.loop.call_soon_threadsafe(self._put, message)
+
+    async def get(self, timeout: float) -> Optional[dict]:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class Hub:
+    def __init__(self, broker: Broker, queue_size: int = 100):
+        self.broker = broker
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._ids = itertools.count(1)
+        broker.start(self._deliver)
+
+    def publish(self, channel: str, event: str, data) -> None:
+        """Fire-and-forget; call after the write has committed."""
+        self.broker.publish(channel, {"event": event, "data": jsonable_encoder(data)})
+
+    def _deliver(self, channel: str, message: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        if not subscribers:
+            return
+        message = {**message, "id": next(self._ids)}
+        for sub in subscribers:
+            try:
+                sub.offer(message)
+            except RuntimeError:
+                pass  # the client's loop is gone; unsubscribe() will clean up
+
+    def subscribe(self, channel: str) -> Subscription:
+        sub = Subscription(channel, self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            subs = self._subscribers.get(sub.channel)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.channel]
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(s) for s in self._subscribers.values())
+
+
+def format_sse(message: dict) -> str:
+    return f"id: {message['id']}\nevent: {message['event']}\ndata: {json.dumps(message['data'], separators=(',', ':'))}\n\n"
+
+
+def _load_broker(path: str) -> Broker:
+    module, _, name = path.partition(":")
+    return getattr(importlib.import_module(module), name)()
+
+
+hub = Hub(_load_broker(settings.EVENTS_BROKER), settings.EVENTS_QUEUE_SIZE)
@@ -0,0 +1,74 @@
+# backend/app/idea_export.py
+# Streaming export of every idea for admin reports.
+#
+# Rows come off a server-side cursor (stream_results + yield_per, i.e.
+# pymysql's SSCursor on MySQL) in id order and are encoded one partition at
+# a time, so memory stays flat however many ideas there are and the first
+# bytes go out as soon as the first partition is read. Vote and comment
+# aggregates are the denormalized counters on ideas, so nothing is grouped.
+import csv
+import io
+import json
+from typing import Iterator
+
+from sqlalchemy import select
+
+from app import models
+from app.database import SessionLocal
+
+FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+COLUMNS = (
+    "id", "title", "description", "status", "category_id", "category_name",
+    "owner_id", "owner_name", "owner_email", "upvotes", "downvotes", "votes",
+    "score", "comments_count", "created_at", "updated_at",
+)
+
+
+def _export_query():
+    Idea, User, Category = models.Idea, models.User, models.Category
+    return (
+        select(
+            Idea.id, Idea.title, Idea.description, Idea.status,
+            Idea.category_id, Category.name.label("category_name"),
+            Idea.owner_id, User.name.label("owner_name"), User.email.label("owner_email"),
+            Idea.upvotes, Idea.downvotes, (Idea.upvotes + Idea.downvotes).label("votes"),
+            Idea.score, Idea.comments_count, Idea.created_at, Idea.updated_at,
+        )
+        .outerjoin(Category, Category.id == Idea.category_id)
+        .outerjoin(User, User.id == Idea.owner_id)
+        .order_by(Idea.id)
+    )
+
+
+def _cell(value):
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def iter_export(fmt: str, batch_size: int = 1000) -> Iterator[str]:
+    """Yield the export in chunks of up to `batch_size` rows.
+
+    Opens its own session: the generator outlives the request's dependencies
+    and runs in the threadpool, one chunk at a time.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(_export_query().execution_options(stream_results=True, yield_per=batch_size))
+        buf = io.StringIO()
+        writer = csv.writer(buf) if fmt == "csv" else None
+        if writer:
+            writer.writerow(COLUMNS)
+        for partition in result.partitions():
+            for row in partition:
+                values = [_cell(v) for v in row]
+                if writer:
+                    writer.writerow(values)
+                else:
+                    buf.write(json.dumps(dict(zip(COLUMNS, values)), ensure_ascii=False))
+                    buf.write("\n")
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+        if buf.tell():
+            yield buf.getvalue()
+    finally:
+        db.close()
@@ -0,0 +1,244 @@
+# backend/app/idea_import.py
+# Bulk import of ideas from CSV or NDJSON, for migrating old suggestion boxes.
+#
+# Records are parsed one at a time from a text stream, resolved against
+# in-memory category/owner maps, and inserted with executemany in batches;
+# a transaction is committed every `batches_per_commit` batches, so a failed
+# import keeps everything committed before it and never holds the whole file.
+import csv
+import io
+import json
+from datetime import datetime
+from typing import IO, Dict, Iterator, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app import changes, models, reports, transitions
+from app.trending import hot_score
+
+FORMATS = ("csv", "ndjson")
+MAX_REPORTED_ERRORS = 1000
+TITLE_MAX = 200
+
+
+class ImportRowError(ValueError):
+    pass
+
+
+def detect_format(filename: Optional[str]) -> Optional[str]:
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return None
+
+
+def text_stream(binary: IO[bytes]) -> IO[str]:
+    # utf-8-sig drops the BOM spreadsheet exports like to add
+    return io.TextIOWrapper(binary, encoding="utf-8-sig", newline="")
+
+
+def iter_records(stream: IO[str], fmt: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """Yield (row number, record, parse error) without reading ahead of the current line."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        row = 1  # the header
+        while True:
+            try:
+                record = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                row += 1
+                yield row, None, f"invalid CSV: {e}"
+                continue
+            row += 1
+            yield row, record, None
+    elif fmt == "ndjson":
+        for row, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield row, None, f"invalid JSON: {e}"
+                continue
+            if not isinstance(record, dict):
+                yield row, None, "expected a JSON object"
+                continue
+            yield row, record, None
+    else:
+        raise ValueError(f"unknown format {fmt!r}")
+
+
+def _text(record: dict, key: str) -> str:
+    value = record.get(key)
+    return "" if value is None else str(value).strip()
+
+
+def _parse_created_at(value: str) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise ImportRowError(f"created_at is not an ISO 8601 timestamp: {value!r}")
+    # stored naive in UTC like the rest of the table
+    if parsed.tzinfo is not None:
+        parsed = parsed.replace(tzinfo=None) - parsed.utcoffset()
+    return parsed
+
+
+class IdeaImporter:
+    """Resolves and inserts records; reusable across files within one session."""
+
+    def __init__(self, db: Session, default_owner_id: Optional[int] = None,
+                 batch_size: int = 500, batches_per_commit: int = 10):
+        self.db = db
+        self.default_owner_id = default_owner_id
+        self.batch_size = max(1, batch_size)
+        self.batches_per_commit = max(1, batches_per_commit)
+        # categories are few: load them all, keyed by lowercased name
+        self.categories: Dict[str, int] = {
+            name.lower(): id for id, name in db.execute(select(models.Category.id, models.Category.name))
+        }
+        self.category_ids = set(self.categories.values())
+        # owners are looked up per batch and remembered, misses included
+        self.owners: Dict[str, Optional[int]] = {}
+
+    def _resolve_owners(self, emails) -> None:
+        missing = {e for e in emails if e and e not in self.owners}
+        if not missing:
+            return
+        for email in missing:
+            self.owners[email] = None
+        rows = self.db.execute(
+            # stored emails keep the case they were registered with
+            select(models.User.id, models.User.email).where(func.lower(models.User.email).in_(missing))
+        )
+        for id, email in rows:
+            self.owners[email.lower()] = id
+
+    def _build(self, record: dict, now: datetime) -> dict:
+        title = _text(record, "title")
+        description = _text(record, "description")
+        if not title:
+            raise ImportRowError("title is required")
+        if len(title) > TITLE_MAX:
+            raise ImportRowError(f"title is longer than {TITLE_MAX} characters")
+        if not description:
+            raise ImportRowError("description is required")
+
+        category = _text(record, "category")
+        category_id = _text(record, "category_id")
+        if category:
+            resolved = self.categories.get(category.lower())
+            if resolved is None:
+                raise ImportRowError(f"unknown category {category!r}")
+        elif category_id:
+            try:
+                resolved = int(category_id)
+            except ValueError:
+                raise ImportRowError(f"category_id is not an integer: {category_id!r}")
+            if resolved not in self.category_ids:
+                raise ImportRowError(f"unknown category_id {resolved}")
+        else:
+            raise ImportRowError("category or category_id is required")
+
+        email = _text(record, "owner_email").lower()
+        if email:
+            owner_id = self.owners.get(email)
+            if owner_id is None:
+                raise ImportRowError(f"unknown owner_email {email!r}")
+        elif self.default_owner_id is not None:
+            owner_id = self.default_owner_id
+        else:
+            raise ImportRowError("owner_email is required")
+
+        status = _text(record, "status") or "Submitted"
+        # only statuses the board's transitions know, spelled the way they store them
+        try:
+            status = transitions.canonical_status(status)
+        except HTTPException as e:
+            raise ImportRowError(e.detail)
+        created_at = _parse_created_at(_text(record, "created_at")) or now
+        return {
+            "title": title,
+            "description": description,
+            "category_id": resolved,
+            "owner_id": owner_id,
+            "status": status,
+            "score": 0.0,
+            "upvotes": 0,
+            "downvotes": 0,
+            "comments_count": 0,
+            "hot_score": hot_score(0, 0, 0, created_at),
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+
+    def run(self, records, dry_run: bool = False) -> dict:
+        """Import (row, record, parse error) triples from iter_records and return a report."""
+        report = {"rows": 0, "imported": 0, "failed": 0, "errors": [], "dry_run": dry_run}
+        now = datetime.utcnow()
+        pending: List[Tuple[int, dict]] = []
+        batches_in_txn = 0
+
+        def fail(row, message):
+            report["failed"] += 1
+            if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                report["errors"].append({"row": row, "error": message})
+
+        def flush():
+            nonlocal batches_in_txn
+            self._resolve_owners(_text(r, "owner_email").lower() for _, r in pending)
+            values = []
+            for row, record in pending:
+                try:
+                    values.append(self._build(record, now))
+                except ImportRowError as e:
+                    fail(row, str(e))
+            pending.clear()
+            if values and not dry_run:
+                self.db.execute(insert(models.Idea), values)
+                reports.record_ideas(self.db, values)
+                batches_in_txn += 1
+                if batches_in_txn >= self.batches_per_commit:
+                    changes.bump_ideas(self.db)
+                    self.db.commit()
+                    batches_in_txn = 0
+            report["imported"] += len(values)
+
+        try:
+            for row, record, error in records:
+                report["rows"] += 1
+                if error:
+                    fail(row, error)
+                    continue
+                pending.append((row, record))
+                if len(pending) >= self.batch_size:
+                    flush()
+            if pending:
+                flush()
+            if dry_run:
+                self.db.rollback()
+            else:
+                if batches_in_txn:
+                    changes.bump_ideas(self.db)
+                self.db.commit()
+                if report["imported"]:
+                    from app import similarity
+                    similarity.index.mark_stale()
+        except Exception:
+            self.db.rollback()
+            raise
+        report["errors_truncated"] = report["failed"] > len(report["errors"])
+        return report
+
+
+def import_ideas(db: Session, stream: IO[str], fmt: str, **options) -> dict:
+    dry_run = options.pop("dry_run", False)
+    return IdeaImporter(db, **options).run(iter_records(stream, fmt), dry_run=dry_run)
@@ -1,17 +1,19 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-import sys
-import os
-
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from app.database import engine
-import app.models as models
-from app.routers import auth, ideas, admin, categories
+import time
 
+_import_started = time.perf_counter()
 
-models.Base.metadata.create_all(bind=engine)
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from app.core.config import settings
+from app.routers import auth, events, health, ideas, evaluations, admin, categories
+from app.pagination import NEXT_CURSOR_HEADER
+from app.compression import CompressionMiddleware
+from app.metrics import MetricsMiddleware
+from app.startup import lifespan
 
-app = FastAPI(title="IgniteIdeas")
+# Importing this module connects to nothing; the database warm-up runs in the
+# lifespan hook (app/startup.py) and the schema is managed by Alembic.
+app = FastAPI(title="IgniteIdeas", lifespan=lifespan(_import_started))
 
 app.add_middleware(
     CORSMiddleware,
@@ -19,9 +21,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_BYTES)
+# added last so it wraps everything, CORS included
+app.add_middleware(MetricsMiddleware)
 
+app.include_router(health.router)
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
+app.include_router(events.router, prefix="/api", tags=["events"])
+if settings.ASYNC_DB:
+    from app.routers import ideas_async
+    # registered first so its routes take precedence over the sync ones
+    app.include_router(ideas_async.router, prefix="/api", tags=["ideas"])
 app.include_router(ideas.router, prefix="/api", tags=["ideas"] )
+app.include_router(evaluations.router, prefix="/api", tags=["evaluations"])
 app.include_router(admin.router, prefix="/api", tags=["admin"])
-app.include_router(categories.router, prefix="/api", tags=["categories"])
\ No newline at end of file
+app.include_router(categories.router, prefix="/api", tags=["categories"])
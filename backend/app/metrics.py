@@ -0,0 +1,206 @@
+# backend/app/metrics.py
+# Per-request latency and SQL instrumentation, rendered in Prometheus text format.
+#
+# MetricsMiddleware opens a RequestStats for each HTTP request in a context
+# variable; the cursor hooks installed by instrument_engine() add every
+# statement's count and duration to it. Sync handlers run in the threadpool
+# with a copy of the context, which still points at the same RequestStats.
+import bisect
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.metrics")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+MAX_LOGGED_STATEMENTS = 50
+
+
+class RequestStats:
+    __slots__ = ("statements", "db_seconds", "sql")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.sql: List[Tuple[str, float]] = []
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self._series: Dict[tuple, list] = {}  # labels -> [bucket counts..., sum, count]
+
+    def observe(self, labels: tuple, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+        i = bisect.bisect_left(self.buckets, value)
+        if i < len(self.buckets):
+            series[i] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self, label_names: Tuple[str, ...]) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._series.items()):
+            base = _labels(label_names, labels)
+            cumulative = 0
+            for bound, n in zip(self.buckets, series):
+                cumulative += n
+                lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{base},le="+Inf"}} {series[-1]}')
+            lines.append(f"{self.name}_sum{{{base}}} {series[-2]}")
+            lines.append(f"{self.name}_count{{{base}}} {series[-1]}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values) -> str:
+    return ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+
+
+class Registry:
+    ROUTE_LABELS = ("method", "route")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = Histogram("ignite_http_request_duration_seconds", "Request latency by route.", LATENCY_BUCKETS)
+        self.db_time = Histogram("ignite_http_request_db_seconds", "Time spent in SQL per request.", LATENCY_BUCKETS)
+        self.statements = Histogram(
+            "ignite_http_request_db_statements", "SQL statements executed per request.", STATEMENT_BUCKETS
+        )
+        self.requests: Dict[tuple, int] = {}
+        self.statements_total = 0
+        self.db_seconds_total = 0.0
+        self.startup: Dict[str, float] = {}
+
+    def record_request(self, method: str, route: str, status: int, seconds: float, stats: RequestStats) -> None:
+        labels = (method, route)
+        with self._lock:
+            self.latency.observe(labels, seconds)
+            self.db_time.observe(labels, stats.db_seconds)
+            self.statements.observe(labels, stats.statements)
+            key = (method, route, str(status))
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+    def count_request(self, method: str, route: str, status: int) -> None:
+        key = (method, route, str(status))
+        with self._lock:
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+    def record_statement(self, seconds: float) -> None:
+        with self._lock:
+            self.statements_total += 1
+            self.db_seconds_total += seconds
+
+    def record_startup(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            self.startup[phase] = seconds
+
+    def render(self) -> str:
+        with self._lock:
+            lines = ["# HELP ignite_http_requests_total Requests by route and status.",
+                     "# TYPE ignite_http_requests_total counter"]
+            for key, n in sorted(self.requests.items()):
+                lines.append(f"ignite_http_requests_total{{{_labels(('method', 'route', 'status'), key)}}} {n}")
+            lines += self.latency.render(self.ROUTE_LABELS)
+            lines += self.db_time.render(self.ROUTE_LABELS)
+            lines += self.statements.render(self.ROUTE_LABELS)
+            lines += [
+                "# HELP ignite_db_statements_total SQL statements executed, in or out of requests.",
+                "# TYPE ignite_db_statements_total counter",
+                f"ignite_db_statements_total {self.statements_total}",
+                "# HELP ignite_db_seconds_total Time spent executing SQL.",
+                "# TYPE ignite_db_seconds_total counter",
+                f"ignite_db_seconds_total {self.db_seconds_total}",
+            ]
+            if self.startup:
+                lines += ["# HELP ignite_startup_seconds Time from importing app.main to serving, by phase.",
+                          "# TYPE ignite_startup_seconds gauge"]
+                lines += [f'ignite_startup_seconds{{phase="{p}"}} {v}' for p, v in sorted(self.startup.items())]
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+def instrument_engine(engine: Engine) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        registry.record_statement(elapsed)
+        stats = _current.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_seconds += elapsed
+            if settings.SLOW_REQUEST_LOG_SQL and len(stats.sql) < MAX_LOGGED_STATEMENTS:
+                stats.sql.append((statement, elapsed))
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency and SQL usage per matched route."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        status = {"code": 500, "stream": False}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                status["stream"] = any(
+                    k == b"content-type" and v.startswith(b"text/event-stream") for k, v in message.get("headers", ())
+                )
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current.reset(token)
+            route = scope.get("route")
+            route_name = getattr(route, "path_format", None) or "unmatched"
+            if status["stream"]:
+                # an SSE connection lasts as long as the client stays; its duration is not a latency
+                registry.count_request(scope["method"], route_name, status["code"])
+            else:
+                registry.record_request(scope["method"], route_name, status["code"], elapsed, stats)
+                if settings.SLOW_REQUEST_SECONDS and elapsed >= settings.SLOW_REQUEST_SECONDS:
+                    _log_slow(scope["method"], route_name, elapsed, stats)
+
+
+def _log_slow(method: str, route: str, elapsed: float, stats: RequestStats) -> None:
+    logger.warning(
+        "slow request %s %s: %.3fs, %d statements, %.3fs in SQL",
+        method, route, elapsed, stats.statements, stats.db_seconds,
+    )
+    for statement, seconds in stats.sql:
+        logger.warning("  %.4fs  %s", seconds, " ".join(statement.split()))
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Float, JSON
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Date, DateTime, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
+from typing import List
 from app.database import Base
 from sqlalchemy.sql import func
 
@@ -10,11 +11,38 @@ class User(Base):
     name = Column(String(100), nullable=False)
     email = Column(String(100), unique=True, index=True, nullable=False)    
     hashed_password = Column(String(255), nullable=False)
-    roles = Column(JSON, nullable=False,default=list)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     ideas = relationship("Idea", back_populates="owner")
+    role_links = relationship("UserRole", cascade="all, delete-orphan", order_by="UserRole.role")
+
+    # keyset paging of the admin user list
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
+
+    @property
+    def roles(self) -> List[str]:
+        return [link.role for link in self.role_links]
+
+    @roles.setter
+    def roles(self, values) -> None:
+        # keep the rows for roles that stay, so re-saving a role never deletes and re-inserts its key
+        wanted = list(dict.fromkeys(values or []))
+        kept = [link for link in self.role_links if link.role in wanted]
+        have = {link.role for link in kept}
+        self.role_links = kept + [UserRole(role=r) for r in wanted if r not in have]
+
+class UserRole(Base):
+    """Role membership, one row per (user, role); the (role, user_id) index answers "who are the evaluators"."""
+    __tablename__ = "user_roles"
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    role = Column(String(50), primary_key=True)
+
+    __table_args__ = (
+        Index("ix_user_roles_role_user", "role", "user_id"),
+    )
 
 class Category(Base):
     __tablename__ = "categories"
@@ -30,20 +58,48 @@ class Idea(Base):
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     status = Column(String(50),default="Submitted",nullable=False)
     score = Column(Float, default=0.0)
+    # denormalized counters, maintained in the same transaction as vote/comment writes
+    upvotes = Column(Integer, nullable=False, default=0, server_default="0")
+    downvotes = Column(Integer, nullable=False, default=0, server_default="0")
+    comments_count = Column(Integer, nullable=False, default=0, server_default="0")
+    hot_score = Column(Float, nullable=False, default=0.0, server_default="0")  # see app/trending.py
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # bumped on status changes, see app/transitions.py
+    revision = Column(Integer, nullable=False, default=1, server_default="1")  # bumped on every visible change, see app/changes.py
+    # running evaluation aggregates (app/evaluations.py): eval_score = eval_total / eval_count
+    eval_count = Column(Integer, nullable=False, default=0, server_default="0")
+    eval_total = Column(Float, nullable=False, default=0.0, server_default="0")
+    eval_score = Column(Float, nullable=False, default=0.0, server_default="0")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     owner = relationship("User", back_populates="ideas")
     category = relationship("Category")
 
+    # one index per list_ideas filter, each ending in the (created_at, id) sort key
+    __table_args__ = (
+        Index("ix_ideas_created_at_id", "created_at", "id"),
+        Index("ix_ideas_owner_created_at_id", "owner_id", "created_at", "id"),
+        Index("ix_ideas_category_created_at_id", "category_id", "created_at", "id"),
+        Index("ix_ideas_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_ideas_hot_score_id", "hot_score", "id"),
+        Index("ix_ideas_eval_score_id", "eval_score", "id"),
+        # SQLite test setups get an FTS5 table instead, see app/search.py
+        Index("ft_ideas_title_description", "title", "description", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
+
 class Vote(Base):
     __tablename__ = "votes"
     id = Column(Integer, primary_key=True, index=True)
     idea_id = Column(Integer, ForeignKey("ideas.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    type = Column(String(10), nullable=False)  # 'upvote' or 'downvote'
+    type = Column(String(10), nullable=False)  # 'up' or 'down'
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # one vote per user per idea; lets counters.upsert_vote use a single statement
+    __table_args__ = (
+        Index("uq_votes_idea_user", "idea_id", "user_id", unique=True),
+    )
+
 class Comment(Base):
     __tablename__ = "comments"
 
@@ -54,14 +110,61 @@ class Comment(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     #updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # serves the per-idea thread in either direction, and keyset paging through it
+    __table_args__ = (
+        Index("ix_comments_idea_created_at_id", "idea_id", "created_at", "id"),
+    )
+
 class Evaluation(Base):
+    """One evaluator's scoring of an idea; the per-criterion scores live in evaluation_scores."""
     __tablename__ = "evaluations"
     id = Column(Integer, primary_key=True, index=True)
     idea_id = Column(Integer, ForeignKey("ideas.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    criteria = Column(String(100), nullable=False) #e.g., "Feasibility ; 9", "Impact;9"
-    total_score = Column(Float, nullable=False)
+    total_score = Column(Float, nullable=False)  # mean of the criterion scores
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # re-scoring an idea replaces the evaluator's previous evaluation
+    __table_args__ = (
+        Index("uq_evaluations_idea_user", "idea_id", "user_id", unique=True),
+    )
+
+class EvaluationScore(Base):
+    __tablename__ = "evaluation_scores"
+    idea_id = Column(Integer, ForeignKey("ideas.id"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    criterion = Column(String(50), primary_key=True)
+    score = Column(Integer, nullable=False)
+
+class IdeaCriterionScore(Base):
+    """Running per-idea, per-criterion aggregate; mean = total / count."""
+    __tablename__ = "idea_criterion_scores"
+    idea_id = Column(Integer, ForeignKey("ideas.id"), primary_key=True)
+    criterion = Column(String(50), primary_key=True)
+    count = Column(Integer, nullable=False, default=0, server_default="0")
+    total = Column(Integer, nullable=False, default=0, server_default="0")
+
+class DailySummary(Base):
+    """Reporting aggregates per (day, category, status), maintained by app/reports.py.
 
+    Every measure is attributed to the idea's current category and status:
+    ideas by the day they were created, votes and comments by the day they
+    were cast. Each (day, category, status) is spread over several `shard`
+    rows, which readers sum.
+    """
+    __tablename__ = "daily_summary"
+    day = Column(Date, primary_key=True)
+    category_id = Column(Integer, primary_key=True)
+    status = Column(String(50), primary_key=True)
+    shard = Column(Integer, primary_key=True, default=0, server_default="0")
+    ideas = Column(Integer, nullable=False, default=0, server_default="0")
+    upvotes = Column(Integer, nullable=False, default=0, server_default="0")
+    downvotes = Column(Integer, nullable=False, default=0, server_default="0")
+    comments = Column(Integer, nullable=False, default=0, server_default="0")
 
+class ChangeVersion(Base):
+    """A counter bumped with every write to a collection (app/changes.py); a collection may span several shard rows."""
+    __tablename__ = "change_versions"
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+    changed_at = Column(DateTime, nullable=True)
@@ -0,0 +1,49 @@
+# backend/app/pagination.py
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: Optional[datetime], row_id: int) -> str:
+    """Opaque keyset cursor for a (created_at, id) ordered listing."""
+    raw = json.dumps([created_at.isoformat() if created_at else None, int(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (datetime.fromisoformat(created_at) if created_at else None), int(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_desc(created_col, id_col, cursor: str):
+    """Rows strictly after the cursor position in a (created_at DESC, id DESC) listing.
+
+    Spelled out as an OR rather than a row-value comparison so MySQL can
+    range-scan the (..., created_at, id) composite indexes.
+    """
+    created_at, row_id = decode_cursor(cursor)
+    if created_at is None:
+        return (created_col.is_(None)) & (id_col < row_id)
+    return (created_col < created_at) | ((created_col == created_at) & (id_col < row_id)) | created_col.is_(None)
+
+
+
+def keyset_asc(created_col, id_col, cursor: str):
+    """Rows strictly after the cursor position in a (created_at ASC, id ASC) listing."""
+    return keyset_after(created_col, id_col, *decode_cursor(cursor))
+
+
+def keyset_after(created_col, id_col, created_at: Optional[datetime], row_id: int):
+    """Rows strictly after (created_at, row_id) in ascending order; NULLs sort first."""
+    if created_at is None:
+        return (created_col.is_(None) & (id_col > row_id)) | created_col.isnot(None)
+    return (created_col > created_at) | ((created_col == created_at) & (id_col > row_id))
@@ -0,0 +1,120 @@
+# backend/app/pool_stats.py
+# Connection pool counters for sizing pools against worker counts.
+#
+# connect/checkout/checkin/invalidate come from pool events; time spent
+# waiting for a free connection (and waits that hit pool_timeout) are timed
+# by a thin QueuePool subclass, since no event fires before a checkout.
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+
+
+class PoolStats:
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.pool = None
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.invalidations = 0
+            self.timeouts = 0
+            self.waits = 0  # checkouts that had to block for a connection
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+            self.overflow_max = 0
+
+    def _incr(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def record_get(self, seconds: float, overflow: int, waited: bool, timed_out: bool = False) -> None:
+        with self._lock:
+            if waited:
+                self.waits += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            self.overflow_max = max(self.overflow_max, overflow)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            out = {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "waits": self.waits,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+                "overflow_max": self.overflow_max,
+            }
+        pool = self.pool
+        if pool is not None and hasattr(pool, "checkedout"):
+            out.update({
+                "pool_class": type(pool).__name__,
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                # QueuePool counts overflow from -pool_size
+                "overflow": max(0, pool.overflow()),
+                "timeout": pool.timeout(),
+            })
+        return out
+
+
+class _TimedGet:
+    stats: PoolStats
+
+    def _do_get(self):
+        # blocks only when nothing is idle and the overflow allowance is used up
+        waited = self._pool.empty() and -1 < self._max_overflow <= self._overflow
+        start = time.perf_counter()
+        try:
+            rec = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record_get(time.perf_counter() - start, max(0, self.overflow()), waited, timed_out=True)
+            raise
+        self.stats.record_get(time.perf_counter() - start, max(0, self.overflow()), waited)
+        return rec
+
+
+def instrumented_pool_class(base, stats: PoolStats):
+    """Subclass of `base` (a QueuePool) that times checkouts into `stats`."""
+    return type(f"Instrumented{base.__name__}", (_TimedGet, base), {"stats": stats})
+
+
+def attach(engine: Engine, stats: PoolStats) -> None:
+    stats.pool = engine.pool
+
+    @event.listens_for(engine, "engine_disposed")
+    def _disposed(engine):
+        stats.pool = engine.pool
+
+    @event.listens_for(engine.pool, "connect")
+    def _connect(dbapi_conn, rec):
+        stats._incr("connects")
+
+    @event.listens_for(engine.pool, "checkout")
+    def _checkout(dbapi_conn, rec, proxy):
+        stats._incr("checkouts")
+
+    @event.listens_for(engine.pool, "checkin")
+    def _checkin(dbapi_conn, rec):
+        stats._incr("checkins")
+
+    @event.listens_for(engine.pool, "invalidate")
+    def _invalidate(dbapi_conn, rec, exception):
+        stats._incr("invalidations")
+
+
+sync_pool_stats = PoolStats("sync")
+async_pool_stats = PoolStats("async")
@@ -0,0 +1,100 @@
+# backend/app/principal_cache.py
+# Bounded TTL/LRU cache of authenticated principals, keyed by bearer token.
+#
+# get_current_user looks the token up here before decoding it or touching
+# the users table, so a hit costs one sha256. An entry lives for the TTL or
+# until the token's own exp, whichever comes first. Admin edits call
+# invalidate(user_id), which drops every token of that user; invalidate_token()
+# drops one. The TTL bounds how long other workers can keep serving a stale
+# copy.
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The parts of a User that request handlers need."""
+    id: int
+    name: str
+    email: str
+    roles: List[str]
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(id=int(user.id), name=user.name, email=user.email, roles=list(user.roles or []))
+
+
+def token_key(token: str) -> bytes:
+    # the raw token is a credential; keep only its digest around
+    return hashlib.sha256(token.encode()).digest()
+
+
+class PrincipalCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[bytes, Tuple[float, Principal]]" = OrderedDict()
+        self._by_user: Dict[int, Set[bytes]] = {}
+
+    def get(self, token: str) -> Optional[Principal]:
+        key = token_key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, principal = entry
+            if expires < time.monotonic():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return principal
+
+    def put(self, token: str, principal: Principal, token_exp: Optional[float] = None) -> None:
+        """Cache `principal` for `token`; `token_exp` is the token's exp claim (epoch seconds)."""
+        ttl = self.ttl
+        if token_exp is not None:
+            ttl = min(ttl, token_exp - time.time())
+            if ttl <= 0:
+                return
+        key = token_key(token)
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (time.monotonic() + ttl, principal)
+            self._by_user.setdefault(principal.id, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: bytes) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._by_user.get(entry[1].id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[entry[1].id]
+
+    def invalidate(self, user_id: int) -> None:
+        """Forget every cached token of `user_id`, e.g. after an admin edit."""
+        with self._lock:
+            for key in list(self._by_user.get(user_id, ())):
+                self._drop(key)
+
+    def invalidate_token(self, token: str) -> None:
+        with self._lock:
+            self._drop(token_key(token))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL_SECONDS)
@@ -0,0 +1,285 @@
+# backend/app/reports.py
+# Incrementally maintained reporting aggregates (models.DailySummary).
+#
+# Writers call record_*() inside the transaction that creates the idea, vote
+# or comment, so the summary commits or rolls back with it. Measures follow
+# the idea's current category and status; move_status() shifts an idea's
+# contributions when its status changes, so a rebuild() from the source
+# tables always reproduces what the incremental path produced.
+#
+# Today's rows for a busy category are written by nearly every vote and
+# comment, and the upsert holds their lock until the writer commits. So, as
+# with the change versions (app/changes.py), every (day, category, status) is
+# spread over SUMMARY_SHARDS rows: bump() adds to one shard picked at random
+# and summary() sums them. Rows are upserted in key order so that two
+# writers touching several keys lock them in the same order.
+#
+# The *_async variants write the same rows on an AsyncSession, for the async
+# write handlers (routers/ideas_async.py).
+import random
+from collections import defaultdict
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select, tuple_
+from sqlalchemy.orm import Session
+
+from app import models
+
+if TYPE_CHECKING:  # the async extension only loads with ASYNC_DB
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+MEASURES = ("ideas", "upvotes", "downvotes", "comments")
+DIMENSIONS = ("day", "category_id", "status")
+SUMMARY_SHARDS = 8
+
+Key = Tuple[date, int, str]
+
+
+def _day(value) -> date:
+    # func.date() comes back as a string on SQLite
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return datetime.utcnow().date()
+
+
+def _deltas() -> Dict[Key, Dict[str, int]]:
+    return defaultdict(lambda: dict.fromkeys(MEASURES, 0))
+
+
+def bump(db: Session, deltas: Dict[Key, Dict[str, int]]) -> None:
+    """Add `deltas` to one shard of the summary rows, creating missing ones, in one executemany upsert."""
+    rows = _shard_rows(deltas)
+    if not rows:
+        return
+    stmt = _upsert_stmt(db.get_bind().dialect.name)
+    if stmt is None:
+        for row in rows:
+            existing = db.get(models.DailySummary, (row["day"], row["category_id"], row["status"], row["shard"]))
+            if existing is None:
+                db.add(models.DailySummary(**row))
+            else:
+                for m in MEASURES:
+                    setattr(existing, m, getattr(existing, m) + row[m])
+        db.flush()
+        return
+    db.execute(stmt, rows)
+
+
+async def bump_async(db: "AsyncSession", deltas: Dict[Key, Dict[str, int]]) -> None:
+    rows = _shard_rows(deltas)
+    if not rows:
+        return
+    stmt = _upsert_stmt(db.get_bind().dialect.name)
+    if stmt is None:
+        await db.run_sync(bump, deltas)
+        return
+    await db.execute(stmt, rows)
+
+
+def _shard_rows(deltas: Dict[Key, Dict[str, int]]) -> List[dict]:
+    shard = random.randrange(SUMMARY_SHARDS)
+    return [
+        {"day": day, "category_id": category_id, "status": status, "shard": shard, **values}
+        for (day, category_id, status), values in sorted(deltas.items())
+        if any(values.values())
+    ]
+
+
+def _upsert_stmt(dialect: str):
+    """The dialect's add-to-or-insert for summary rows, or None where it has none."""
+    table = models.DailySummary.__table__
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        stmt = mysql_insert(table)
+        return stmt.on_duplicate_key_update({m: table.c[m] + stmt.inserted[m] for m in MEASURES})
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        stmt = sqlite_insert(table)
+        return stmt.on_conflict_do_update(
+            index_elements=[*DIMENSIONS, "shard"], set_={m: table.c[m] + stmt.excluded[m] for m in MEASURES}
+        )
+    return None
+
+
+def _idea_deltas(ideas: Iterable[dict]) -> Dict[Key, Dict[str, int]]:
+    deltas = _deltas()
+    for idea in ideas:
+        deltas[(_day(idea["created_at"]), idea["category_id"], idea["status"])]["ideas"] += 1
+    return deltas
+
+
+def _vote_deltas(votes: Iterable[tuple]) -> Dict[Key, Dict[str, int]]:
+    deltas = _deltas()
+    for idea, day, up, down in votes:
+        if up or down:
+            key = (_day(day), idea.category_id, idea.status)
+            deltas[key]["upvotes"] += up
+            deltas[key]["downvotes"] += down
+    return deltas
+
+
+def _comment_deltas(idea, day, delta: int) -> Dict[Key, Dict[str, int]]:
+    deltas = _deltas()
+    deltas[(_day(day), idea.category_id, idea.status)]["comments"] += delta
+    return deltas
+
+
+def record_ideas(db: Session, ideas: Iterable[dict]) -> None:
+    """`ideas` are dicts with created_at, category_id and status (e.g. rows just inserted)."""
+    bump(db, _idea_deltas(ideas))
+
+
+async def record_ideas_async(db: "AsyncSession", ideas: Iterable[dict]) -> None:
+    await bump_async(db, _idea_deltas(ideas))
+
+
+def record_vote(db: Session, idea, day, up: int, down: int) -> None:
+    """`idea` has category_id and status (see counters.lock_idea_counters); `day` is when the vote was cast."""
+    record_votes(db, [(idea, day, up, down)])
+
+
+async def record_vote_async(db: "AsyncSession", idea, day, up: int, down: int) -> None:
+    await bump_async(db, _vote_deltas([(idea, day, up, down)]))
+
+
+def record_votes(db: Session, votes: Iterable[tuple]) -> None:
+    """record_vote for many (idea, day, up, down) at once."""
+    bump(db, _vote_deltas(votes))
+
+
+def record_comment(db: Session, idea, day, delta: int = 1) -> None:
+    bump(db, _comment_deltas(idea, day, delta))
+
+
+async def record_comment_async(db: "AsyncSession", idea, day, delta: int = 1) -> None:
+    await bump_async(db, _comment_deltas(idea, day, delta))
+
+
+def _contributions(db: Session, idea_criteria) -> Dict[Key, Dict[str, int]]:
+    """What the ideas matching `idea_criteria` add to the summary, from the source tables."""
+    Idea, Vote, Comment = models.Idea, models.Vote, models.Comment
+    out = _deltas()
+    day = func.date(Idea.created_at)
+    for d, category_id, status, n in db.execute(
+        select(day, Idea.category_id, Idea.status, func.count())
+        .where(*idea_criteria)
+        .group_by(day, Idea.category_id, Idea.status)
+    ):
+        out[(_day(d), category_id, status)]["ideas"] += n
+    day = func.date(Vote.created_at)
+    for d, category_id, status, kind, n in db.execute(
+        select(day, Idea.category_id, Idea.status, Vote.type, func.count())
+        .join(Idea, Idea.id == Vote.idea_id)
+        .where(*idea_criteria)
+        .group_by(day, Idea.category_id, Idea.status, Vote.type)
+    ):
+        if kind in ("up", "down"):
+            out[(_day(d), category_id, status)][kind + "votes"] += n
+    day = func.date(Comment.created_at)
+    for d, category_id, status, n in db.execute(
+        select(day, Idea.category_id, Idea.status, func.count())
+        .join(Idea, Idea.id == Comment.idea_id)
+        .where(*idea_criteria)
+        .group_by(day, Idea.category_id, Idea.status)
+    ):
+        out[(_day(d), category_id, status)]["comments"] += n
+    return out
+
+
+def move_status(db: Session, idea_ids: List[int], new_status: str) -> None:
+    """Shift the ideas' contributions to `new_status`.
+
+    Call in the same transaction and before ideas.status is updated; the
+    grouped reads use the per-idea indexes on votes and comments.
+    """
+    if not idea_ids:
+        return
+    current = _contributions(db, [models.Idea.id.in_(idea_ids), models.Idea.status != new_status])
+    deltas = _deltas()
+    for (day, category_id, status), values in current.items():
+        for m, n in values.items():
+            deltas[(day, category_id, status)][m] -= n
+            deltas[(day, category_id, new_status)][m] += n
+    bump(db, deltas)
+    if current:
+        _fold(db, sorted(current))
+
+
+def _fold(db: Session, keys: List[Key]) -> None:
+    """Collapse the shards of `keys` into shard 0, dropping the keys that sum to nothing.
+
+    move_status() empties the old keys of the moved ideas only in total, so
+    this is what keeps them out of the table, as a rebuild would.
+    """
+    S = models.DailySummary
+    match = tuple_(S.day, S.category_id, S.status).in_(keys)
+    totals = _deltas()
+    shards = (
+        select(S.day, S.category_id, S.status, *[getattr(S, m) for m in MEASURES])
+        .where(match)
+        .order_by(S.day, S.category_id, S.status, S.shard)
+        .with_for_update()
+    )
+    for row in db.execute(shards):
+        for m in MEASURES:
+            totals[(row.day, row.category_id, row.status)][m] += getattr(row, m)
+    db.execute(delete(S).where(match).execution_options(synchronize_session=False))
+    rows = [
+        {"day": day, "category_id": category_id, "status": status, "shard": 0, **values}
+        for (day, category_id, status), values in sorted(totals.items())
+        if any(values.values())
+    ]
+    if rows:
+        db.execute(insert(S), rows)
+
+
+def rebuild(db: Session, batch_size: int = 5000) -> int:
+    """Recompute the whole summary, into shard 0, from ideas, votes and comments; returns the row count.
+
+    Runs in one transaction. Writes that commit while it runs can be lost, so
+    run it when the site is quiet (or after a bulk load that bypassed the API).
+    """
+    totals = _contributions(db, [])
+    rows = [
+        {"day": day, "category_id": category_id, "status": status, "shard": 0, **values}
+        for (day, category_id, status), values in totals.items()
+    ]
+    try:
+        db.execute(delete(models.DailySummary))
+        for i in range(0, len(rows), batch_size):
+            db.execute(insert(models.DailySummary), rows[i:i + batch_size])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return len(rows)
+
+
+def summary(db: Session, group_by=DIMENSIONS, start: Optional[date] = None, end: Optional[date] = None,
+            category_id: Optional[int] = None, status: Optional[str] = None) -> List[dict]:
+    """Sum the summary rows over their shards and everything not in `group_by`; reads nothing else."""
+    S = models.DailySummary
+    columns = [getattr(S, d) for d in DIMENSIONS if d in group_by]
+    stmt = select(*columns, *[func.sum(getattr(S, m)).label(m) for m in MEASURES])
+    if start:
+        stmt = stmt.where(S.day >= start)
+    if end:
+        stmt = stmt.where(S.day <= end)
+    if category_id is not None:
+        stmt = stmt.where(S.category_id == category_id)
+    if status:
+        stmt = stmt.where(S.status == status)
+    if columns:
+        stmt = stmt.group_by(*columns).order_by(*columns)
+    out = []
+    for row in db.execute(stmt):
+        item = dict(row._mapping)
+        for m in MEASURES:
+            item[m] = int(item[m] or 0)
+        out.append(item)
+    return out
@@ -1,9 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
-from typing import List
-from app import models, schemas
+from datetime import date
+from typing import List, Optional
+from app import changes, models, reports, schemas
+from app.category_cache import category_cache
+from app.idea_export import FORMATS as EXPORT_FORMATS, iter_export
+from app.idea_import import FORMATS, detect_format, import_ideas, text_stream
 from app.database import get_db
-from app.deps import require_roles
+from app.deps import get_current_user, require_roles
+from app.pool_stats import async_pool_stats, sync_pool_stats
+from app.metrics import registry
+from app.pagination import NEXT_CURSOR_HEADER, encode_cursor, keyset_desc
+from app.principal_cache import Principal, principal_cache
+from app.serialization import json_response
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -13,6 +24,7 @@ def create_category(payload: schemas.CategoryIn, db: Session = Depends(get_db)):
     cat = models.Category(name=payload.name.strip())
     db.add(cat)
     db.commit()
+    category_cache.invalidate()
     db.refresh(cat)
     return cat
 
@@ -39,6 +51,7 @@ def update_category(category_id: int, payload: dict, db: Session = Depends(get_d
         cat.name = new_name
     db.add(cat)
     db.commit()
+    category_cache.invalidate()
     db.refresh(cat)
     return cat
 
@@ -49,24 +62,77 @@ def delete_category(category_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Category not found")
     db.delete(cat)
     db.commit()
+    category_cache.invalidate()
     return {"detail": "deleted"}
 
-# USER MANAGEMENT (unchanged behavior)
+# USER MANAGEMENT
+ROLE_MAX = 50
+
+def _clean_roles(values) -> List[str]:
+    if not isinstance(values, list):
+        raise HTTPException(status_code=400, detail="roles must be a list")
+    roles = []
+    for value in values:
+        role = value.strip() if isinstance(value, str) else ""
+        if not role or len(role) > ROLE_MAX:
+            raise HTTPException(status_code=400, detail=f"Roles must be strings of 1-{ROLE_MAX} characters")
+        if role not in roles:
+            roles.append(role)
+    return roles
+
+# Newest first; page with the X-Next-Cursor header. `role` keeps members of that
+# role (user_roles index), `name` matches a substring and `email` a prefix.
 @router.get("/users", response_model=List[schemas.UserOut], dependencies=[Depends(require_roles("admin"))])
-def list_users(db: Session = Depends(get_db)):
-    users = db.query(models.User).order_by(models.User.created_at.desc()).all()
-    for u in users:
-        if u.roles is None:
-            u.roles = []
-    return users
+def list_users(
+    role: Optional[str] = None,
+    name: Optional[str] = None,
+    email: Optional[str] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    if not 1 <= limit <= 200:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 200")
+    User, UserRole = models.User, models.UserRole
+    stmt = select(User.id, User.name, User.email, User.created_at)
+    if role:
+        stmt = stmt.join(UserRole, (UserRole.user_id == User.id) & (UserRole.role == role.strip()))
+    if name:
+        stmt = stmt.where(User.name.contains(name, autoescape=True))
+    if email:
+        stmt = stmt.where(User.email.startswith(email, autoescape=True))
+    if cursor:
+        stmt = stmt.where(keyset_desc(User.created_at, User.id, cursor))
+    rows = db.execute(stmt.order_by(User.created_at.desc(), User.id.desc()).limit(limit)).all()
+
+    roles = {}
+    if rows:
+        for user_id, r in db.execute(
+            select(UserRole.user_id, UserRole.role)
+            .where(UserRole.user_id.in_([row.id for row in rows]))
+            .order_by(UserRole.user_id, UserRole.role)
+        ):
+            roles.setdefault(user_id, []).append(r)
+    out = [{"id": r.id, "name": r.name, "email": r.email, "roles": roles.get(r.id, [])} for r in rows]
+    headers = {}
+    if len(rows) == limit:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return json_response(List[schemas.UserOut], out, headers=headers)
+
+# Member count per role, straight off the user_roles index
+@router.get("/roles", dependencies=[Depends(require_roles("admin"))])
+def role_counts(db: Session = Depends(get_db)):
+    UserRole = models.UserRole
+    rows = db.execute(
+        select(UserRole.role, func.count()).group_by(UserRole.role).order_by(UserRole.role)
+    ).all()
+    return [{"role": role, "users": n} for role, n in rows]
 
 @router.get("/users/{user_id}", response_model=schemas.UserOut, dependencies=[Depends(require_roles("admin"))])
 def get_user(user_id: int, db: Session = Depends(get_db)):
     user = db.get(models.User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    if user.roles is None:
-        user.roles = []
     return user
 
 @router.patch("/users/{user_id}", dependencies=[Depends(require_roles("admin"))])
@@ -74,12 +140,17 @@ def update_user(user_id: int, payload: dict, db: Session = Depends(get_db)):
     user = db.get(models.User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    if 'name' in payload:
+    renamed = 'name' in payload and payload['name'] != user.name
+    if renamed:
         user.name = payload['name']
+        # owner_name is part of every idea they own
+        db.execute(
+            update(models.Idea).where(models.Idea.owner_id == user_id)
+            .values(revision=models.Idea.revision + 1)
+            .execution_options(synchronize_session=False)
+        )
     if 'roles' in payload:
-        if not isinstance(payload['roles'], list):
-            raise HTTPException(status_code=400, detail="roles must be a list")
-        user.roles = payload['roles']
+        user.roles = _clean_roles(payload['roles'])
     if 'email' in payload:
         user.email = payload['email']
     if 'active' in payload:
@@ -88,10 +159,12 @@ def update_user(user_id: int, payload: dict, db: Session = Depends(get_db)):
         except Exception:
             pass
     db.add(user)
+    if renamed:
+        db.flush()
+        changes.bump_ideas(db)
     db.commit()
+    principal_cache.invalidate(user_id)
     db.refresh(user)
-    if user.roles is None:
-        user.roles = []
     return {"id": user.id, "name": user.name, "email": user.email, "roles": user.roles}
 
 @router.delete("/users/{user_id}", dependencies=[Depends(require_roles("admin"))])
@@ -101,4 +174,83 @@ def delete_user(user_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="User not found")
     db.delete(user)
     db.commit()
+    principal_cache.invalidate(user_id)
     return {"detail": "deleted"}
+
+# BULK IDEA IMPORT
+@router.post("/ideas/import", dependencies=[Depends(require_roles("admin"))])
+def import_ideas_file(
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    batch_size: int = 500,
+    batches_per_commit: int = 10,
+    dry_run: bool = False,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """CSV or NDJSON with title, description, category (name) or category_id,
+    owner_email, and optional status/created_at. Rows without an owner_email
+    are owned by the importing admin."""
+    fmt = format or detect_format(file.filename)
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=400, detail="format must be csv or ndjson")
+    if not 1 <= batch_size <= 5000 or batches_per_commit < 1:
+        raise HTTPException(status_code=400, detail="batch_size must be 1-5000 and batches_per_commit at least 1")
+    # the upload is spooled to disk past a small size; parse it straight off the file
+    return import_ideas(
+        db, text_stream(file.file), fmt,
+        default_owner_id=current_user.id,
+        batch_size=batch_size,
+        batches_per_commit=batches_per_commit,
+        dry_run=dry_run,
+    )
+
+# IDEA EXPORT
+@router.get("/ideas/export", dependencies=[Depends(require_roles("admin"))])
+def export_ideas(format: str = "csv", batch_size: int = 1000):
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="format must be csv or ndjson")
+    if not 1 <= batch_size <= 10000:
+        raise HTTPException(status_code=400, detail="batch_size must be 1-10000")
+    return StreamingResponse(
+        iter_export(format, batch_size),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="ideas.{format}"'},
+    )
+
+# REPORTS (reads only the daily_summary aggregates, see app/reports.py)
+@router.get("/reports/summary", dependencies=[Depends(require_roles("admin"))])
+def report_summary(
+    group_by: List[str] = Query(list(reports.DIMENSIONS)),
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    category_id: Optional[int] = None,
+    status: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    unknown = set(group_by) - set(reports.DIMENSIONS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"group_by must be among {', '.join(reports.DIMENSIONS)}")
+    rows = reports.summary(db, group_by, start, end, category_id, status)
+    if "category_id" in group_by:
+        names = category_cache.names(db, {r["category_id"] for r in rows})
+        for r in rows:
+            r["category_name"] = names.get(r["category_id"])
+    totals = {m: sum(r[m] for r in rows) for m in reports.MEASURES}
+    return {"group_by": [d for d in reports.DIMENSIONS if d in group_by], "rows": rows, "totals": totals}
+
+# DATABASE POOL
+@router.get("/db/pool", dependencies=[Depends(require_roles("admin"))])
+def pool_stats(reset: bool = False):
+    out = {"sync": sync_pool_stats.snapshot()}
+    if async_pool_stats.pool is not None:
+        out["async"] = async_pool_stats.snapshot()
+    if reset:
+        sync_pool_stats.reset()
+        async_pool_stats.reset()
+    return out
+
+# METRICS (Prometheus text exposition format)
+@router.get("/metrics", response_class=PlainTextResponse, dependencies=[Depends(require_roles("admin"))])
+def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -1,36 +1,72 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app import models, schemas
 from app.database import get_db
-from app.core.security import hash_password, verify_password, create_access_token
+from app.core.security import HashingBusy, hash_password_async, verify_password_async, create_access_token
 from app.deps import get_current_user
+from app.principal_cache import Principal
 
 router = APIRouter()
 
+def _user_by_email(db: Session, email: str):
+    user = db.query(models.User).filter(models.User.email == email).first()
+    # hand the connection back to the pool before waiting on bcrypt
+    db.close()
+    return user
+
+def _add_user(db: Session, user: models.User) -> models.User:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+def _store_rehash(db: Session, user_id: int, new_hash: str) -> None:
+    db.query(models.User).filter(models.User.id == user_id).update({"hashed_password": new_hash})
+    db.commit()
+
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-ins in progress, try again shortly",
+        headers={"Retry-After": "1"},
+    )
+
+# register/login are async so bcrypt waits on its own executor (core/security.py)
+# instead of holding a request thread; the short DB calls go through the threadpool.
 @router.post("/register", response_model=schemas.UserOut)
-def register(payload: schemas.UserCreate, db: Session = Depends(get_db)):
-    existing = db.query(models.User).filter(models.User.email == payload.email).first()
+async def register(payload: schemas.UserCreate, db: Session = Depends(get_db)):
+    existing = await run_in_threadpool(_user_by_email, db, payload.email)
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
+    try:
+        hashed = await hash_password_async(payload.password)
+    except HashingBusy:
+        raise _hashing_busy()
     user = models.User(
         name=payload.name,
         email=payload.email,
-        hashed_password=hash_password(payload.password),
+        hashed_password=hashed,
         roles=["user"]
     )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
+    return await run_in_threadpool(_add_user, db, user)
 
 @router.post("/login", response_model=schemas.Token)
-def login(payload: schemas.UserLogin, db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.email == payload.email).first()
-    if not user or not verify_password(payload.password, user.hashed_password):
+async def login(payload: schemas.UserLogin, db: Session = Depends(get_db)):
+    user = await run_in_threadpool(_user_by_email, db, payload.email)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    try:
+        valid, new_hash = await verify_password_async(payload.password, user.hashed_password)
+    except HashingBusy:
+        raise _hashing_busy()
+    if not valid:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    if new_hash:
+        await run_in_threadpool(_store_rehash, db, user.id, new_hash)
     token = create_access_token(subject=user.id)
     return {"access_token": token, "token_type": "bearer"}
 
 @router.get("/me", response_model=schemas.UserOut)
-def me(current_user: models.User = Depends(get_current_user)):
+def me(current_user: Principal = Depends(get_current_user)):
     return current_user
@@ -1,12 +1,23 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from typing import List
-from app import models, schemas
+from app import schemas
+from app.category_cache import category_cache
+from app.conditional import etag_matches, not_modified
 from app.database import get_db
 
 
 router = APIRouter(prefix="/categories", tags=["categories"])
 
+def category_catalogue(request: Request, db: Session):
+    """Serve the cached catalogue, or a 304 when the client's copy is current."""
+    items, etag = category_cache.snapshot(db)
+    headers = {"Cache-Control": "no-cache"}
+    if etag_matches(request, etag):
+        return not_modified(etag, headers)
+    return JSONResponse(items, headers={"ETag": etag, **headers})
+
 @router.get("/", response_model=List[schemas.CategoryOut])
-def public_categories(db: Session = Depends(get_db)):
-    return db.query(models.Category).order_by(models.Category.name.asc()).all()
\ No newline at end of file
+def public_categories(request: Request, db: Session = Depends(get_db)):
+    return category_catalogue(request, db)
\ No newline at end of file
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app import evaluations, schemas
+from app.database import get_db
+from app.deps import require_roles
+from app.principal_cache import Principal
+
+router = APIRouter(prefix="/ideas", tags=["evaluations"])
+
+reviewer = require_roles("evaluator", "admin")
+
+# Score one idea; re-scoring replaces the evaluator's previous scores for it.
+@router.post("/{idea_id}/evaluations")
+def evaluate_idea(idea_id: int, payload: schemas.EvalIn, db: Session = Depends(get_db), current_user: Principal = Depends(reviewer)):
+    return evaluations.submit(db, current_user, [(idea_id, payload.criteria_scores)])[0]
+
+# Score many ideas in one transaction.
+@router.post("/evaluations")
+def evaluate_ideas(payload: schemas.EvalBatchIn, db: Session = Depends(get_db), current_user: Principal = Depends(reviewer)):
+    return evaluations.submit(db, current_user, [(e.idea_id, e.criteria_scores) for e in payload.evaluations])
+
+# Running aggregates: count and mean overall, count/sum/mean per criterion.
+@router.get("/{idea_id}/evaluations/summary", dependencies=[Depends(reviewer)])
+def evaluation_summary(idea_id: int, db: Session = Depends(get_db)):
+    out = evaluations.idea_aggregates(db, [idea_id])
+    if idea_id not in out:
+        raise HTTPException(status_code=404, detail="Idea not found")
+    return {"idea_id": idea_id, **out[idea_id]}
@@ -0,0 +1,51 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from app import models
+from app.core.config import settings
+from app.database import SessionLocal
+from app.events import GLOBAL_CHANNEL, format_sse, hub, idea_channel
+
+# Included ahead of the ideas routers so /ideas/events is not taken for an idea id.
+router = APIRouter(prefix="/ideas", tags=["events"])
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _idea_exists(idea_id: int) -> bool:
+    # a short-lived session: the stream itself must not hold a pooled connection
+    db = SessionLocal()
+    try:
+        return db.get(models.Idea, idea_id) is not None
+    finally:
+        db.close()
+
+
+def _stream(request: Request, channel: str) -> StreamingResponse:
+    sub = hub.subscribe(channel)
+
+    async def events():
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                message = await sub.get(settings.EVENTS_HEARTBEAT_SECONDS)
+                # comments keep idle connections open through proxies
+                yield format_sse(message) if message else ": keep-alive\n\n"
+        finally:
+            hub.unsubscribe(sub)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+# New ideas, as `idea` events carrying the same fields as list_ideas items.
+@router.get("/events")
+async def idea_feed(request: Request):
+    return _stream(request, GLOBAL_CHANNEL)
+
+
+# `vote` events carry the idea's new counts, `comment` events the new comment.
+@router.get("/{idea_id}/events")
+async def idea_events(idea_id: int, request: Request):
+    if not await run_in_threadpool(_idea_exists, idea_id):
+        raise HTTPException(status_code=404, detail="Idea not found")
+    return _stream(request, idea_channel(idea_id))
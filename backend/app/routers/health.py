@@ -0,0 +1,33 @@
+# backend/app/routers/health.py
+# Probes for the orchestrator, mounted at the root (no /api prefix).
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.startup import check_database, retry_warm_up, state
+
+router = APIRouter(tags=["health"])
+
+
+@router.get("/healthz")
+def healthz():
+    """Liveness: the process is serving requests. Never touches the database."""
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+async def readyz():
+    """Readiness: warm-up has succeeded and the database answers.
+
+    After a failed warm-up each probe retries it and reports why it failed.
+    """
+    if not state.ready:
+        if state.error is None:
+            return JSONResponse({"status": "starting"}, status_code=503)
+        if not await retry_warm_up():
+            return JSONResponse({"status": "warm-up failed", "error": state.error}, status_code=503)
+    try:
+        await run_in_threadpool(check_database)
+    except Exception as e:
+        return JSONResponse({"status": "unavailable", "error": type(e).__name__}, status_code=503)
+    return {"status": "ready", "startup_seconds": {k: round(v, 4) for k, v in state.timings.items()}}
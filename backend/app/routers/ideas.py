@@ -1,180 +1,354 @@
 # backend/app/routers/ideas.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from pydantic import ValidationError, parse_obj_as
 import logging
+from datetime import datetime
 
-from app import models, schemas
+from app import changes, counters, deadlocks, models, reports, schemas, search, transitions
+from app.events import GLOBAL_CHANNEL, hub, idea_channel
+from app.category_cache import category_cache
+from app.conditional import cache_headers, etag_matches, not_modified
+from app.core.config import settings
 from app.database import get_db
 from app.deps import get_current_user
+from app.principal_cache import Principal
+from app.trending import hot_score
+from app.pagination import NEXT_CURSOR_HEADER, encode_cursor, keyset_after, keyset_asc, keyset_desc
+from app.routers.categories import category_catalogue
+from app.serialization import json_response
+from app.vote_buffer import vote_buffer
 
 router = APIRouter(prefix="/ideas", tags=["ideas"])
 
+IdeaList = List[schemas.IdeaOut]
+CommentList = List[schemas.CommentOut]
+
 # Public categories endpoint
 @router.get("/categories/", response_model=List[schemas.CategoryOut])
-def public_categories(db: Session = Depends(get_db)):
-    return db.query(models.Category).order_by(models.Category.name.asc()).all()
+def public_categories(request: Request, db: Session = Depends(get_db)):
+    return category_catalogue(request, db)
 
 
-# Create idea (authenticated)
-@router.post("/", response_model=schemas.IdeaOut, status_code=201)
-def create_idea(payload: schemas.IdeaCreate, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
-    idea = models.Idea(
+def _similarity():
+    # numpy and the related-ideas index load on first use rather than at startup
+    from app import similarity
+    return similarity
+
+
+def _idea_filters(owner_id: Optional[int], category_id: Optional[int], status: Optional[str]) -> list:
+    criteria = []
+    if owner_id is not None:
+        criteria.append(models.Idea.owner_id == owner_id)
+    if category_id is not None:
+        criteria.append(models.Idea.category_id == category_id)
+    if status:
+        criteria.append(models.Idea.status == status)
+    return criteria
+
+
+def _idea_listing(db: Session, *criteria, **options):
+    return db.execute(_idea_listing_stmt(*criteria, **options)).all()
+
+
+def _idea_listing_stmt(*criteria, limit: Optional[int] = None, offset: int = 0, trending: bool = False,
+                       top_rated: bool = False, matches=None):
+    """Ideas with owner names and their stored counters, as one statement.
+
+    Newest first by default; `trending` orders by the precomputed hot_score
+    instead (see app/trending.py), `top_rated` by the running evaluation mean
+    (see app/evaluations.py), and a `matches` subquery from app/search.py
+    restricts to search hits ordered by relevance.
+    """
+    if trending:
+        order = (models.Idea.hot_score.desc(), models.Idea.id.desc())
+    elif top_rated:
+        order = (models.Idea.eval_score.desc(), models.Idea.id.desc())
+    else:
+        order = (models.Idea.created_at.desc(), models.Idea.id.desc())
+    stmt = (
+        select(
+            models.Idea,
+            models.User.name.label("owner_name"),
+        )
+        .outerjoin(models.User, models.User.id == models.Idea.owner_id)
+        .where(*criteria)
+    )
+    if matches is not None:
+        stmt = stmt.join(matches, matches.c.idea_id == models.Idea.id)
+        order = (matches.c.relevance.desc(), models.Idea.id.desc())
+    stmt = stmt.order_by(*order)
+    if offset:
+        stmt = stmt.offset(offset)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+def _idea_items(db: Session, rows) -> List[dict]:
+    """Rows from _idea_listing as response dicts; category names come from the in-memory catalogue."""
+    names = category_cache.names(db, _category_ids(rows))
+    return [_idea_item(r, names) for r in rows]
+
+
+def _category_ids(rows) -> set:
+    return {r[0].category_id for r in rows}
+
+
+def _idea_item(row, category_names: dict) -> dict:
+    r, owner_name = row
+    return {
+        "id": int(r.id),
+        "title": r.title or "",
+        "description": r.description or "",
+        "category_id": int(r.category_id) if r.category_id is not None else None,
+        "category_name": category_names.get(r.category_id),
+        "owner_id": int(r.owner_id) if r.owner_id is not None else None,
+        "owner_name": owner_name,
+        "status": r.status or "Submitted",
+        "score": float(r.score) if r.score is not None else 0.0,
+        "created_at": r.created_at,
+        "votes": int(r.upvotes or 0) + int(r.downvotes or 0),
+        "upvotes": int(r.upvotes or 0),
+        "downvotes": int(r.downvotes or 0),
+        "comments_count": int(r.comments_count or 0),
+        "version": int(r.version or 1),
+        "eval_count": int(r.eval_count or 0),
+        "eval_score": float(r.eval_score or 0.0),
+    }
+
+
+def _new_idea(payload: schemas.IdeaCreate, owner_id: int) -> models.Idea:
+    now = datetime.utcnow()
+    return models.Idea(
         title=payload.title,
         description=payload.description,
         category_id=payload.category_id,
-        owner_id=current_user.id,
+        owner_id=owner_id,
         status="Submitted",
+        created_at=now,
+        hot_score=hot_score(0, 0, 0, now),
     )
-    db.add(idea)
-    db.commit()
-    db.refresh(idea)
-
-    # compute counts
-    votes_count = db.query(models.Vote).filter(models.Vote.idea_id == idea.id).count()
-    comments_count = db.query(models.Comment).filter(models.Comment.idea_id == idea.id).count()
-    owner = db.get(models.User, idea.owner_id)
-    owner_name = owner.name if owner else None
-
-    item = {
-        "id": int(idea.id),
-        "title": idea.title or "",
-        "description": idea.description or "",
-        "category_id": int(idea.category_id) if idea.category_id is not None else None,
-        "owner_id": int(idea.owner_id) if idea.owner_id is not None else None,
-        "owner_name": owner_name,
-        "status": idea.status or "Submitted",
-        "score": float(idea.score) if getattr(idea, "score", None) is not None else 0.0,
-        "created_at": getattr(idea, "created_at", None),
-        "votes": int(votes_count),
-        "comments_count": int(comments_count),
-    }
 
-    try:
-        return schemas.IdeaOut(**item)
-    except ValidationError as e:
-        logging.exception("Failed to validate created idea against schema: %s", e)
-        return item
+
+# Create idea (authenticated)
+@router.post("/", response_model=schemas.IdeaOut, status_code=201)
+def create_idea(payload: schemas.IdeaCreate, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_user)):
+    def write():
+        idea = _new_idea(payload, current_user.id)
+        db.add(idea)
+        reports.record_ideas(db, [{"created_at": idea.created_at, "category_id": idea.category_id, "status": idea.status}])
+        changes.bump_ideas(db)
+        db.commit()
+        return idea
+
+    idea = deadlocks.run_transaction(db, write)
+    _similarity().index.add(idea.id, payload.title, payload.description)
+
+    rows = _idea_listing(db, models.Idea.id == idea.id, limit=1)
+    item = _idea_items(db, rows)[0]
+    hub.publish(GLOBAL_CHANNEL, "idea", item)
+    return json_response(schemas.IdeaOut, item, status_code=201)
+
+
+# Status changes (Kanban boards). Reviewers may move any idea, owners their own;
+# send the idea's `version` to have a concurrent move rejected with 409.
+@router.post("/status", response_model=List[schemas.StatusOut])
+def change_statuses(payload: schemas.StatusBatchIn, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_user)):
+    changes = [(c.id, c.status, c.version) for c in payload.changes]
+    return transitions.apply_status_changes(db, changes, current_user)
+
+
+@router.post("/{idea_id}/status", response_model=schemas.StatusOut)
+def change_status(idea_id: int, payload: schemas.StatusIn, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_user)):
+    return transitions.apply_status_changes(db, [(idea_id, payload.status, payload.version)], current_user)[0]
 
 
 # List ideas (supports category filtering & owner filtering & status)
+# Pass `cursor` (the X-Next-Cursor header of the previous page) instead of
+# `skip` to page by (created_at, id) keyset; every page then costs the same.
+# `trending=true` ranks by hot_score and `top_rated=true` by evaluation mean;
+# both page with `skip` only. Responses carry an ETag from the collection's
+# change version (app/changes.py); If-None-Match gets a 304 without a query.
 @router.get("/", response_model=List[schemas.IdeaOut])
 def list_ideas(
+    request: Request,
     owner_id: Optional[int] = None,
     category_id: Optional[int] = None,
     status: Optional[str] = None,
     skip: int = 0,
     limit: int = 50,
+    cursor: Optional[str] = None,
+    trending: bool = False,
+    top_rated: bool = False,
     db: Session = Depends(get_db),
 ):
-    q = db.query(models.Idea)
-    if owner_id is not None:
-        q = q.filter(models.Idea.owner_id == owner_id)
-    if category_id is not None:
-        q = q.filter(models.Idea.category_id == category_id)
-    if status:
-        q = q.filter(models.Idea.status == status)
+    criteria = _listing_criteria(owner_id, category_id, status, cursor, trending, top_rated)
+    version, changed_at = changes.ideas_version(db)
+    _, categories_etag = category_cache.snapshot(db)
+    etag, headers = _listing_validators(version, changed_at, categories_etag)
+    if etag_matches(request, etag):
+        return not_modified(etag, headers)
 
-    rows = q.order_by(models.Idea.created_at.desc()).offset(skip).limit(limit).all()
+    out = _idea_items(db, _idea_listing(db, *criteria, limit=limit, offset=0 if cursor else skip,
+                                        trending=trending, top_rated=top_rated))
+    _add_next_cursor(headers, out, limit, trending or top_rated)
+    return json_response(IdeaList, out, headers=headers)
 
-    out = []
-    for r in rows:
-        votes_count = int(db.query(models.Vote).filter(models.Vote.idea_id == r.id).count())
-        comments_count = int(db.query(models.Comment).filter(models.Comment.idea_id == r.id).count())
 
-        owner_name = None
-        if r.owner_id:
-            owner = db.get(models.User, r.owner_id)
-            owner_name = owner.name if owner else None
+def _listing_criteria(owner_id, category_id, status, cursor, trending, top_rated) -> list:
+    """Check list_ideas' parameters and return its filter criteria."""
+    if trending and top_rated:
+        raise HTTPException(status_code=400, detail="trending and top_rated are mutually exclusive")
+    if (trending or top_rated) and cursor:
+        raise HTTPException(status_code=400, detail="cursor paging is not supported with trending or top_rated")
+    criteria = _idea_filters(owner_id, category_id, status)
+    if cursor:
+        criteria.append(keyset_desc(models.Idea.created_at, models.Idea.id, cursor))
+    return criteria
 
-        # populate category_name safely
-        category_name = None
-        if getattr(r, "category_id", None) is not None:
-            cat = db.get(models.Category, r.category_id)
-            category_name = cat.name if cat else None
 
-        item = {
-            "id": int(r.id),
-            "title": r.title or "",
-            "description": r.description or "",
-            "category_id": int(r.category_id) if r.category_id is not None else None,
-            "category_name": category_name,
-            "owner_id": int(r.owner_id) if r.owner_id is not None else None,
-            "owner_name": owner_name,
-            "status": r.status or "Submitted",
-            "score": float(r.score) if getattr(r, "score", None) is not None else 0.0,
-            "created_at": getattr(r, "created_at", None),
-            "votes": int(votes_count),
-            "comments_count": int(comments_count),
-        }
-        out.append(item)
+def _listing_validators(version: int, changed_at, categories_etag: str):
+    etag = changes.make_etag("ideas", version, categories_etag)
+    return etag, cache_headers(etag, changes.http_date(changed_at))
 
-    try:
-        validated = parse_obj_as(List[schemas.IdeaOut], out)
-        return validated
-    except ValidationError as ve:
-        logging.exception("Idea list response failed validation: %s", ve)
-        # return raw list on dev if validation fails
-        return out
+
+def _add_next_cursor(headers: dict, out: List[dict], limit: int, ranked: bool) -> None:
+    if not ranked and out and len(out) == limit:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(out[-1]["created_at"], out[-1]["id"])
+
+
+# Full-text search, ranked by relevance; takes the same filters as list_ideas
+@router.get("/search", response_model=List[schemas.IdeaOut])
+def search_ideas(
+    q: str,
+    owner_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    status: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 50,
+    db: Session = Depends(get_db),
+):
+    matches = search.matches(db, q)
+    if matches is None:
+        return []
+    criteria = _idea_filters(owner_id, category_id, status)
+    out = _idea_items(db, _idea_listing(db, *criteria, limit=limit, offset=skip, matches=matches))
+    return json_response(IdeaList, out)
 
 
 @router.get("/{idea_id}", response_model=schemas.IdeaOut)
-def get_idea(idea_id: int, db: Session = Depends(get_db)):
-    r = db.get(models.Idea, idea_id)
-    if not r:
+def get_idea(idea_id: int, request: Request, db: Session = Depends(get_db)):
+    current = changes.idea_revision(db, idea_id)
+    if current is None:
         raise HTTPException(status_code=404, detail="Idea not found")
+    _, categories_etag = category_cache.snapshot(db)
+    etag, headers = _idea_validators(idea_id, current, categories_etag)
+    if etag_matches(request, etag):
+        return not_modified(etag, headers)
 
-    votes_count = int(db.query(models.Vote).filter(models.Vote.idea_id == r.id).count())
-    comments_count = int(db.query(models.Comment).filter(models.Comment.idea_id == r.id).count())
+    rows = _idea_listing(db, models.Idea.id == idea_id, limit=1)
+    if not rows:
+        raise HTTPException(status_code=404, detail="Idea not found")
+    return json_response(schemas.IdeaOut, _idea_items(db, rows)[0], headers=headers)
 
-    owner_name = None
-    if r.owner_id:
-        owner = db.get(models.User, r.owner_id)
-        owner_name = owner.name if owner else None
 
-    category_name = None
-    if getattr(r, "category_id", None) is not None:
-        cat = db.get(models.Category, r.category_id)
-        category_name = cat.name if cat else None
+def _idea_validators(idea_id: int, current, categories_etag: str):
+    revision, updated_at = current
+    etag = changes.make_etag("idea", idea_id, revision, categories_etag)
+    return etag, cache_headers(etag, changes.http_date(updated_at))
 
-    item = {
-        "id": int(r.id),
-        "title": r.title or "",
-        "description": r.description or "",
-        "category_id": int(r.category_id) if r.category_id is not None else None,
-        "category_name": category_name,
-        "owner_id": int(r.owner_id) if r.owner_id is not None else None,
-        "owner_name": owner_name,
-        "status": r.status or "Submitted",
-        "score": float(r.score) if getattr(r, "score", None) is not None else 0.0,
-        "created_at": getattr(r, "created_at", None),
-        "votes": int(votes_count),
-        "comments_count": int(comments_count),
-    }
 
-    try:
-        return schemas.IdeaOut(**item)
-    except ValidationError as e:
-        logging.exception("Get idea validation failed: %s", e)
-        return item
+@router.get("/{idea_id}/related", response_model=List[schemas.IdeaOut])
+def related_ideas(idea_id: int, k: int = 5, db: Session = Depends(get_db)):
+    if k < 1 or k > 50:
+        raise HTTPException(status_code=400, detail="k must be between 1 and 50")
+    if db.get(models.Idea, idea_id) is None:
+        raise HTTPException(status_code=404, detail="Idea not found")
 
+    ranked = _similarity().related_ideas(db, idea_id, k)
+    if not ranked:
+        return []
+    rank = {i: n for n, (i, _) in enumerate(ranked)}
+    rows = _idea_listing(db, models.Idea.id.in_(list(rank)))
+    out = sorted(_idea_items(db, rows), key=lambda item: rank[item["id"]])
+    return json_response(IdeaList, out)
 
+
+# Comments thread, oldest first by default (`order=desc` for newest first).
+# Page with the X-Next-Cursor header; `after=<comment_id>` returns only the
+# comments posted after that one (oldest first), for refreshing a thread.
 @router.get("/{idea_id}/comments", response_model=List[schemas.CommentOut])
-def list_comments(idea_id: int, db: Session = Depends(get_db)):
-    rows = db.query(models.Comment).filter(models.Comment.idea_id == idea_id).order_by(models.Comment.created_at.asc()).all()
-    out = []
-    for r in rows:
-        user = db.get(models.User, r.user_id)
-        out.append({
+def list_comments(
+    idea_id: int,
+    order: str = "asc",
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    after: Optional[int] = None,
+    db: Session = Depends(get_db),
+):
+    _check_comment_paging(order, limit, cursor, after)
+    anchor = None
+    if after is not None:
+        anchor = db.execute(_comment_anchor_stmt(idea_id, after)).first()
+    rows = db.execute(_comments_stmt(idea_id, order, limit, cursor, after, anchor)).all()
+    return _comments_response(rows, limit)
+
+
+def _check_comment_paging(order: str, limit: int, cursor: Optional[str], after: Optional[int]) -> None:
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be asc or desc")
+    if not 1 <= limit <= 200:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 200")
+    if after is not None and (cursor or order == "desc"):
+        raise HTTPException(status_code=400, detail="after cannot be combined with cursor or order=desc")
+
+
+def _comment_anchor_stmt(idea_id: int, after: int):
+    Comment = models.Comment
+    return select(Comment.created_at, Comment.id).where(Comment.id == after, Comment.idea_id == idea_id)
+
+
+def _comments_stmt(idea_id: int, order: str, limit: int, cursor: Optional[str], after: Optional[int], anchor):
+    """One page of a thread; `anchor` is the _comment_anchor_stmt row when `after` is given."""
+    Comment = models.Comment
+    criteria = [Comment.idea_id == idea_id]
+    if after is not None:
+        if anchor is None:
+            raise HTTPException(status_code=404, detail="Comment not found")
+        criteria.append(keyset_after(Comment.created_at, Comment.id, anchor.created_at, anchor.id))
+    elif cursor:
+        keyset = keyset_desc if order == "desc" else keyset_asc
+        criteria.append(keyset(Comment.created_at, Comment.id, cursor))
+
+    sort = (Comment.created_at.desc(), Comment.id.desc()) if order == "desc" else \
+        (Comment.created_at.asc(), Comment.id.asc())
+    return (
+        select(Comment, models.User.name)
+        .outerjoin(models.User, models.User.id == Comment.user_id)
+        .where(*criteria)
+        .order_by(*sort)
+        .limit(limit)
+    )
+
+
+def _comments_response(rows, limit: int):
+    out = [
+        {
             "id": int(r.id),
             "idea_id": int(r.idea_id),
             "user_id": int(r.user_id) if r.user_id is not None else None,
-            "user_name": user.name if user else None,
+            "user_name": user_name,
             "content": r.content,
-            "created_at": getattr(r, "created_at", None),
-        })
-    return out
+            "created_at": r.created_at,
+        }
+        for r, user_name in rows
+    ]
+    headers = {}
+    if len(out) == limit:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(out[-1]["created_at"], out[-1]["id"])
+    return json_response(CommentList, out, headers=headers)
 
 
 @router.post("/{idea_id}/comments", response_model=schemas.CommentOut, status_code=201)
@@ -182,67 +356,119 @@ def create_comment(
     idea_id: int,
     payload: schemas.CommentCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     if current_user is None:
         raise HTTPException(status_code=401, detail="Authentication required")
 
-    idea = db.get(models.Idea, idea_id)
-    if not idea:
-        raise HTTPException(status_code=404, detail="Idea not found")
-
-    comment = models.Comment(
-        idea_id=idea_id,
-        user_id=current_user.id,
-        content=payload.content,
-    )
-
-    try:
+    def write():
+        idea = counters.increment_comments(db, idea_id)
+        if not idea:
+            return None
+        now = datetime.utcnow()
+        comment = models.Comment(
+            idea_id=idea_id,
+            user_id=current_user.id,
+            content=payload.content,
+            created_at=now,  # explicit so reports bucket it on the same UTC day
+        )
+        reports.record_comment(db, idea, now)
         db.add(comment)
         db.flush()   # helps catch DB errors early
+        changes.bump_ideas(db)
         db.commit()
         db.refresh(comment)
+        return comment
+
+    try:
+        comment = deadlocks.run_transaction(db, write)
     except Exception as e:
         db.rollback()
         logging.exception("Error saving comment to DB: %s", e)
         raise HTTPException(status_code=500, detail="Failed to save comment")
+    if comment is None:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Idea not found")
+
+    out = _comment_item(comment, current_user)
+    hub.publish(idea_channel(idea_id), "comment", out)
+    return json_response(schemas.CommentOut, out, status_code=201)
 
-    user = db.get(models.User, comment.user_id)
-    out = {
+
+def _comment_item(comment, author: Principal) -> dict:
+    return {
         "id": int(comment.id),
         "idea_id": int(comment.idea_id),
         "user_id": int(comment.user_id) if comment.user_id is not None else None,
-        "user_name": user.name if user else None,
+        "user_name": author.name,
         "content": comment.content,
         "created_at": getattr(comment, "created_at", None),
     }
 
-    try:
-        return schemas.CommentOut(**out)
-    except ValidationError as e:
-        logging.exception("Create comment validation failed: %s", e)
-        return out
-    
+
 @router.post("/{idea_id}/vote", status_code=200)
-def vote(idea_id: int, payload: schemas.VoteIn, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+def vote(idea_id: int, payload: schemas.VoteIn, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_user)):
     if payload.type not in ("up", "down"):
         raise HTTPException(status_code=400, detail="Invalid vote type")
-    idea = db.get(models.Idea, idea_id)
-    if not idea:
+    if settings.VOTE_WRITE_BEHIND:
+        return _buffer_vote(db, idea_id, current_user.id, payload.type)
+
+    def write():
+        idea = counters.lock_idea_counters(db, idea_id)
+        if not idea:
+            return None
+        existing = db.execute(_stored_vote_stmt(idea_id, current_user.id)).first()
+        previous = existing.type if existing else None
+        up, down = counters.vote_deltas(previous, payload.type)
+        if previous != payload.type:
+            counters.upsert_vote(db, idea_id, current_user.id, payload.type)
+            counters.apply_vote_deltas(db, idea, up, down)
+            # a changed vote keeps its original created_at, so it stays on that day
+            reports.record_vote(db, idea, existing.created_at if existing else datetime.utcnow(), up, down)
+            changes.bump_ideas(db)
+        db.commit()
+        return idea, up, down
+
+    written = deadlocks.run_transaction(db, write)
+    if written is None:
         raise HTTPException(status_code=404, detail="Idea not found")
+    return _vote_result(idea_id, *written)
 
-    existing = db.query(models.Vote).filter(models.Vote.idea_id == idea_id, models.Vote.user_id == current_user.id).first()
-    if existing:
-        existing.type = payload.type
-    else:
-        v = models.Vote(idea_id=idea_id, user_id=current_user.id, type=payload.type)
-        db.add(v)
-    db.commit()
 
-    up_count = db.query(models.Vote).filter(models.Vote.idea_id == idea_id, models.Vote.type == "up").count()
-    down_count = db.query(models.Vote).filter(models.Vote.idea_id == idea_id, models.Vote.type == "down").count()
-    idea.score = float(up_count - down_count)
-    db.add(idea)
-    db.commit()
+def _stored_vote_stmt(idea_id: int, user_id: int):
+    return select(models.Vote.type, models.Vote.created_at).where(
+        models.Vote.idea_id == idea_id, models.Vote.user_id == user_id
+    )
+
+
+def _vote_result(idea_id: int, idea, up: int, down: int) -> dict:
+    """The vote response for `idea` as locked before the vote; publishes the new counts when they moved."""
+    up_count = int(idea.upvotes) + up
+    down_count = int(idea.downvotes) + down
+    if up or down:
+        hub.publish(idea_channel(idea_id), "vote", {
+            "idea_id": idea_id, "upvotes": up_count, "downvotes": down_count,
+            "votes": up_count + down_count, "score": float(up_count - down_count),
+        })
+    return {"votes": up_count, "downs": down_count, "score": float(up_count - down_count)}
+
 
-    return {"votes": int(up_count), "downs": int(down_count), "score": float(idea.score)}
+def _buffered_counts_stmt(idea_id: int):
+    return select(models.Idea.upvotes, models.Idea.downvotes).where(models.Idea.id == idea_id)
+
+
+def _buffered_vote_result(idea, up: int, down: int) -> dict:
+    up_count = int(idea.upvotes) + up
+    down_count = int(idea.downvotes) + down
+    return {"votes": up_count, "downs": down_count, "score": float(up_count - down_count), "pending": True}
+
+
+def _buffer_vote(db: Session, idea_id: int, user_id: int, vote_type: str) -> dict:
+    """Write-behind vote: no locks or writes here, the counts returned are provisional."""
+    idea = db.execute(_buffered_counts_stmt(idea_id)).first()
+    if not idea:
+        raise HTTPException(status_code=404, detail="Idea not found")
+    stored = db.execute(_stored_vote_stmt(idea_id, user_id)).first()
+    db.rollback()
+    up, down = vote_buffer.add(idea_id, user_id, vote_type, stored.type if stored else None)
+    return _buffered_vote_result(idea, up, down)
@@ -0,0 +1,228 @@
+# backend/app/routers/ideas_async.py
+# Async versions of the hot idea endpoints, mounted ahead of routers/ideas.py
+# when ASYNC_DB is set. Listing, detail and the comment thread await their
+# queries on an AsyncSession; creating an idea, commenting and voting await
+# the same counter, vote, daily summary and change-version statements as the
+# sync handlers (the *_async helpers in app/counters.py, app/reports.py and
+# app/changes.py) in one transaction, retried on deadlock like theirs.
+#
+# Everything runs on the event loop here, so only cheap Python belongs in
+# these routes. The similarity index update after a new idea, and encoding
+# large idea pages, go to the threadpool. Search, related ideas and the
+# status board stay on the sync handlers: their ranking and bulk work would
+# stall every other request on the worker.
+import logging
+from datetime import datetime
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app import changes, counters, deadlocks, models, reports, schemas
+from app.category_cache import category_cache
+from app.conditional import etag_matches, not_modified
+from app.core.config import settings
+from app.database import get_async_db
+from app.deps import get_current_user
+from app.events import GLOBAL_CHANNEL, hub, idea_channel
+from app.principal_cache import Principal
+from app.routers import ideas
+from app.serialization import json_response
+from app.vote_buffer import vote_buffer
+
+router = APIRouter(prefix="/ideas", tags=["ideas"])
+
+# pages with more items than this are encoded off the event loop
+ENCODE_INLINE_MAX = 100
+
+
+async def _json_response(tp: Any, data: list, headers: Optional[dict] = None):
+    if len(data) > ENCODE_INLINE_MAX:
+        return await run_in_threadpool(json_response, tp, data, headers=headers)
+    return json_response(tp, data, headers=headers)
+
+
+async def _idea_items(db: AsyncSession, rows) -> List[dict]:
+    # the catalogue is normally cached; a reload runs through the session's greenlet
+    names = await db.run_sync(lambda s: category_cache.names(s, ideas._category_ids(rows)))
+    return [ideas._idea_item(r, names) for r in rows]
+
+
+@router.get("/", response_model=List[schemas.IdeaOut])
+async def list_ideas(
+    request: Request,
+    owner_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    status: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    trending: bool = False,
+    top_rated: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+):
+    criteria = ideas._listing_criteria(owner_id, category_id, status, cursor, trending, top_rated)
+    version, changed_at = await changes.ideas_version_async(db)
+    _, categories_etag = await db.run_sync(category_cache.snapshot)
+    etag, headers = ideas._listing_validators(version, changed_at, categories_etag)
+    if etag_matches(request, etag):
+        return not_modified(etag, headers)
+
+    rows = (await db.execute(ideas._idea_listing_stmt(
+        *criteria, limit=limit, offset=0 if cursor else skip, trending=trending, top_rated=top_rated,
+    ))).all()
+    out = await _idea_items(db, rows)
+    ideas._add_next_cursor(headers, out, limit, trending or top_rated)
+    return await _json_response(ideas.IdeaList, out, headers=headers)
+
+
+# the sync handler, in the threadpool; registered here only so that
+# /{idea_id} below does not capture /search
+router.add_api_route("/search", ideas.search_ideas, methods=["GET"], response_model=List[schemas.IdeaOut])
+
+
+@router.get("/{idea_id}", response_model=schemas.IdeaOut)
+async def get_idea(idea_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    current = await changes.idea_revision_async(db, idea_id)
+    if current is None:
+        raise HTTPException(status_code=404, detail="Idea not found")
+    _, categories_etag = await db.run_sync(category_cache.snapshot)
+    etag, headers = ideas._idea_validators(idea_id, current, categories_etag)
+    if etag_matches(request, etag):
+        return not_modified(etag, headers)
+
+    rows = (await db.execute(ideas._idea_listing_stmt(models.Idea.id == idea_id, limit=1))).all()
+    if not rows:
+        raise HTTPException(status_code=404, detail="Idea not found")
+    return json_response(schemas.IdeaOut, (await _idea_items(db, rows))[0], headers=headers)
+
+
+@router.get("/{idea_id}/comments", response_model=List[schemas.CommentOut])
+async def list_comments(
+    idea_id: int,
+    order: str = "asc",
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    after: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    ideas._check_comment_paging(order, limit, cursor, after)
+    anchor = None
+    if after is not None:
+        anchor = (await db.execute(ideas._comment_anchor_stmt(idea_id, after))).first()
+    rows = (await db.execute(ideas._comments_stmt(idea_id, order, limit, cursor, after, anchor))).all()
+    # at most 200 comments, cheap enough to encode inline
+    return ideas._comments_response(rows, limit)
+
+
+@router.post("/", response_model=schemas.IdeaOut, status_code=201)
+async def create_idea(
+    payload: schemas.IdeaCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    async def write():
+        idea = ideas._new_idea(payload, current_user.id)
+        db.add(idea)
+        await reports.record_ideas_async(
+            db, [{"created_at": idea.created_at, "category_id": idea.category_id, "status": idea.status}]
+        )
+        await db.flush()
+        idea_id = idea.id
+        await changes.bump_ideas_async(db)
+        await db.commit()
+        return idea_id
+
+    idea_id = await deadlocks.run_transaction_async(db, write)
+    await run_in_threadpool(ideas._similarity().index.add, idea_id, payload.title, payload.description)
+
+    rows = (await db.execute(ideas._idea_listing_stmt(models.Idea.id == idea_id, limit=1))).all()
+    item = (await _idea_items(db, rows))[0]
+    hub.publish(GLOBAL_CHANNEL, "idea", item)
+    return json_response(schemas.IdeaOut, item, status_code=201)
+
+
+@router.post("/{idea_id}/comments", response_model=schemas.CommentOut, status_code=201)
+async def create_comment(
+    idea_id: int,
+    payload: schemas.CommentCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    if current_user is None:
+        raise HTTPException(status_code=401, detail="Authentication required")
+
+    async def write():
+        idea = await counters.increment_comments_async(db, idea_id)
+        if not idea:
+            return None
+        comment = models.Comment(
+            idea_id=idea_id,
+            user_id=current_user.id,
+            content=payload.content,
+            created_at=datetime.utcnow(),  # explicit so reports bucket it on the same UTC day
+        )
+        await reports.record_comment_async(db, idea, comment.created_at)
+        db.add(comment)
+        await db.flush()
+        out = ideas._comment_item(comment, current_user)
+        await changes.bump_ideas_async(db)
+        await db.commit()
+        return out
+
+    try:
+        out = await deadlocks.run_transaction_async(db, write)
+    except Exception as e:
+        await db.rollback()
+        logging.exception("Error saving comment to DB: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to save comment")
+    if out is None:
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="Idea not found")
+    hub.publish(idea_channel(idea_id), "comment", out)
+    return json_response(schemas.CommentOut, out, status_code=201)
+
+
+@router.post("/{idea_id}/vote", status_code=200)
+async def vote(
+    idea_id: int,
+    payload: schemas.VoteIn,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    if payload.type not in ("up", "down"):
+        raise HTTPException(status_code=400, detail="Invalid vote type")
+    if settings.VOTE_WRITE_BEHIND:
+        return await _buffer_vote(db, idea_id, current_user.id, payload.type)
+
+    async def write():
+        idea = await counters.lock_idea_counters_async(db, idea_id)
+        if not idea:
+            return None
+        existing = (await db.execute(ideas._stored_vote_stmt(idea_id, current_user.id))).first()
+        previous = existing.type if existing else None
+        up, down = counters.vote_deltas(previous, payload.type)
+        if previous != payload.type:
+            await counters.upsert_vote_async(db, idea_id, current_user.id, payload.type)
+            await counters.apply_vote_deltas_async(db, idea, up, down)
+            # a changed vote keeps its original created_at, so it stays on that day
+            await reports.record_vote_async(db, idea, existing.created_at if existing else datetime.utcnow(), up, down)
+            await changes.bump_ideas_async(db)
+        await db.commit()
+        return idea, up, down
+
+    written = await deadlocks.run_transaction_async(db, write)
+    if written is None:
+        raise HTTPException(status_code=404, detail="Idea not found")
+    return ideas._vote_result(idea_id, *written)
+
+
+async def _buffer_vote(db: AsyncSession, idea_id: int, user_id: int, vote_type: str) -> dict:
+    idea = (await db.execute(ideas._buffered_counts_stmt(idea_id))).first()
+    if not idea:
+        raise HTTPException(status_code=404, detail="Idea not found")
+    stored = (await db.execute(ideas._stored_vote_stmt(idea_id, user_id))).first()
+    await db.rollback()
+    up, down = vote_buffer.add(idea_id, user_id, vote_type, stored.type if stored else None)
+    return ideas._buffered_vote_result(idea, up, down)
@@ -39,7 +39,12 @@ class IdeaOut(BaseModel):
     status: str
     score: float
     votes: Optional[int] = 0
+    upvotes: Optional[int] = 0
+    downvotes: Optional[int] = 0
     comments_count: Optional[int] = 0
+    version: Optional[int] = 1
+    eval_count: Optional[int] = 0
+    eval_score: Optional[float] = 0.0
     created_at: Any
     class Config:
         from_attributes = True
@@ -63,8 +68,26 @@ class VoteIn(BaseModel):
 class EvalIn(BaseModel):
     criteria_scores: Dict[str, int]
 
+class EvalBatchItem(EvalIn):
+    idea_id: int
+
+class EvalBatchIn(BaseModel):
+    evaluations: List[EvalBatchItem]
+
 class StatusIn(BaseModel):
     status: str
+    version: Optional[int] = None #version the client last saw; stale -> 409
+
+class StatusChange(StatusIn):
+    id: int
+
+class StatusBatchIn(BaseModel):
+    changes: List[StatusChange]
+
+class StatusOut(BaseModel):
+    id: int
+    status: str
+    version: int
 
 class CategoryIn(BaseModel):
     name:str
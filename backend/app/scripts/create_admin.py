@@ -2,6 +2,7 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from app.core.security import hash_password
+from app.core.config import settings
 from app.database import SessionLocal, engine
 from app import models
 
@@ -22,5 +23,6 @@ def create_admin():
     print("Admin user created with email : admin@ignite.com / password : adminpassword")
 
 if __name__ == "__main__":
-    models.Base.metadata.create_all(bind=engine)
+    if settings.DB_CREATE_ALL:
+        models.Base.metadata.create_all(bind=engine)
     create_admin()
\ No newline at end of file
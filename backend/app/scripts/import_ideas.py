@@ -0,0 +1,47 @@
+import sys
+import os
+import argparse
+import json
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.database import SessionLocal
+from app.idea_import import FORMATS, detect_format, import_ideas, text_stream
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import ideas from a CSV or NDJSON file.")
+    parser.add_argument("path", help="file to import, or - for stdin")
+    parser.add_argument("--format", choices=FORMATS, help="defaults to the file extension")
+    parser.add_argument("--owner-id", type=int, help="owner for rows without an owner_email")
+    parser.add_argument("--batch-size", type=int, default=500, help="rows per executemany")
+    parser.add_argument("--batches-per-commit", type=int, default=10, help="batches per transaction")
+    parser.add_argument("--dry-run", action="store_true", help="validate only, insert nothing")
+    args = parser.parse_args()
+
+    fmt = args.format or detect_format(args.path)
+    if fmt is None:
+        parser.error("cannot tell the format from the file name; pass --format")
+
+    stream = text_stream(sys.stdin.buffer) if args.path == "-" else open(args.path, encoding="utf-8-sig", newline="")
+    db = SessionLocal()
+    try:
+        report = import_ideas(
+            db, stream, fmt,
+            default_owner_id=args.owner_id,
+            batch_size=args.batch_size,
+            batches_per_commit=args.batches_per_commit,
+            dry_run=args.dry_run,
+        )
+    finally:
+        db.close()
+        stream.close()
+
+    for e in report["errors"]:
+        print(f"row {e['row']}: {e['error']}", file=sys.stderr)
+    if report["errors_truncated"]:
+        print(f"... only the first {len(report['errors'])} errors are listed", file=sys.stderr)
+    summary = {k: report[k] for k in ("rows", "imported", "failed", "dry_run")}
+    print(json.dumps(summary))
+    if report["failed"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.database import SessionLocal
+from app.reports import rebuild
+
+# Run after loading data outside the API, or if the summaries are suspected to have drifted.
+if __name__ == "__main__":
+    db = SessionLocal()
+    try:
+        n = rebuild(db)
+    finally:
+        db.close()
+    print(f"Rebuilt {n} daily summary row(s).")
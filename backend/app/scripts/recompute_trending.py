@@ -0,0 +1,14 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.database import SessionLocal
+from app.trending import recompute_hot_scores
+
+# Run after changing TRENDING_* settings, or periodically from cron as a safety net.
+if __name__ == "__main__":
+    db = SessionLocal()
+    try:
+        n = recompute_hot_scores(db)
+    finally:
+        db.close()
+    print(f"Recomputed hot scores for {n} idea(s).")
@@ -0,0 +1,34 @@
+import sys
+import os
+import argparse
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.database import SessionLocal
+from app.counters import find_counter_drift, repair_counters
+
+def main():
+    parser = argparse.ArgumentParser(description="Check (and optionally fix) the denormalized vote/comment counters on ideas.")
+    parser.add_argument("--fix", action="store_true", help="rewrite drifted counters from the votes/comments tables")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        drift = repair_counters(db) if args.fix else find_counter_drift(db)
+    finally:
+        db.close()
+
+    for d in drift:
+        print(
+            f"idea {d['id']}: upvotes {d['upvotes']} -> {d['actual_upvotes']}, "
+            f"downvotes {d['downvotes']} -> {d['actual_downvotes']}, "
+            f"comments {d['comments_count']} -> {d['actual_comments_count']}"
+        )
+    if not drift:
+        print("No counter drift found.")
+    elif args.fix:
+        print(f"Repaired {len(drift)} idea(s).")
+    else:
+        print(f"{len(drift)} idea(s) drifted; rerun with --fix to repair.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
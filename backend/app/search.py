@@ -0,0 +1,84 @@
+# backend/app/search.py
+# Relevance-ranked idea search over title/description.
+#
+# MySQL uses the FULLTEXT index declared on models.Idea (MATCH ... AGAINST in
+# natural language mode). SQLite, used for local and test setups, keeps an
+# FTS5 external-content table in sync with ideas through triggers and ranks
+# with bm25. Any other backend falls back to an unranked LIKE scan.
+import re
+from typing import List
+
+from sqlalchemy import Integer, column, event, func, literal, literal_column, or_, select, table
+from sqlalchemy.orm import Session
+
+from app import models
+
+FULLTEXT_INDEX = "ft_ideas_title_description"
+
+SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS ideas_fts USING fts5("
+    "title, description, content='ideas', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS ideas_fts_ai AFTER INSERT ON ideas BEGIN "
+    "INSERT INTO ideas_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS ideas_fts_ad AFTER DELETE ON ideas BEGIN "
+    "INSERT INTO ideas_fts(ideas_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS ideas_fts_au AFTER UPDATE OF title, description ON ideas BEGIN "
+    "INSERT INTO ideas_fts(ideas_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO ideas_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+]
+SQLITE_FTS_REBUILD = "INSERT INTO ideas_fts(ideas_fts) VALUES ('rebuild')"
+SQLITE_FTS_DROP = "DROP TABLE IF EXISTS ideas_fts"
+
+ideas_fts = table("ideas_fts", column("rowid", Integer))
+
+
+@event.listens_for(models.Idea.__table__, "after_create")
+def _create_sqlite_fts(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        for ddl in SQLITE_FTS_DDL:
+            connection.exec_driver_sql(ddl)
+
+
+@event.listens_for(models.Idea.__table__, "before_drop")
+def _drop_sqlite_fts(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql(SQLITE_FTS_DROP)
+
+
+def search_terms(q: str) -> List[str]:
+    return re.findall(r"\w+", q.lower())
+
+
+def matches(db: Session, q: str):
+    """Subquery of (idea_id, relevance) for ideas matching `q`, higher relevance first.
+
+    Returns None when `q` has no searchable terms.
+    """
+    terms = search_terms(q)
+    if not terms:
+        return None
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import match
+        relevance = match(models.Idea.title, models.Idea.description, against=" ".join(terms))
+        return (
+            select(models.Idea.id.label("idea_id"), relevance.label("relevance"))
+            .where(relevance > 0)
+            .subquery("matches")
+        )
+
+    if dialect == "sqlite":
+        # quoted terms OR-ed together, mirroring MySQL's natural language mode
+        fts_query = " OR ".join('"%s"' % t for t in terms)
+        fts = literal_column("ideas_fts")
+        return (
+            select(ideas_fts.c.rowid.label("idea_id"), (-func.bm25(fts)).label("relevance"))
+            .where(fts.op("MATCH")(fts_query))
+            .subquery("matches")
+        )
+
+    like = or_(*[
+        or_(models.Idea.title.ilike(f"%{t}%"), models.Idea.description.ilike(f"%{t}%")) for t in terms
+    ])
+    return select(models.Idea.id.label("idea_id"), literal(0.0).label("relevance")).where(like).subquery("matches")
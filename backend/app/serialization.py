@@ -0,0 +1,39 @@
+# backend/app/serialization.py
+# One-pass JSON responses for the hot idea/comment endpoints.
+#
+# Handlers build plain dicts straight from the row tuples; encode() validates
+# them against the output schema once, through a TypeAdapter built the first
+# time that schema is used, and pydantic-core writes the JSON bytes. The
+# bytes go out in a PreEncodedJSONResponse, which FastAPI returns as-is, so
+# response_model (kept on the routes for the OpenAPI schema) does not
+# validate and encode the payload a second time.
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def adapter(tp: Any) -> TypeAdapter:
+    return TypeAdapter(tp)
+
+
+def encode(tp: Any, data: Any) -> bytes:
+    """Validate `data` as `tp` and return it as JSON bytes."""
+    a = adapter(tp)
+    return a.dump_json(a.validate_python(data))
+
+
+class PreEncodedJSONResponse(Response):
+    """A JSON response whose body has already been encoded (see encode())."""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return adapter(Any).dump_json(content)
+
+
+def json_response(tp: Any, data: Any, status_code: int = 200, headers: Optional[dict] = None) -> Response:
+    return PreEncodedJSONResponse(encode(tp, data), status_code=status_code, headers=headers)
@@ -0,0 +1,253 @@
+# backend/app/similarity.py
+# In-process "related ideas" index: hashed TF-IDF vectors over title/description.
+#
+# Terms are hashed (crc32, signed) into RELATED_VECTOR_DIM buckets, so the
+# vocabulary never has to be stored. Rows are L2-normalised and kept sparse,
+# CSR-style: one flat array of bucket numbers and one of weights, plus each
+# row's offset into them. The index therefore costs a few bytes per distinct
+# term of an idea instead of RELATED_VECTOR_DIM floats per idea, and a lookup
+# is one pass over the stored weights plus an argpartition. IDF weights are
+# fixed when the index is built in bulk; ideas added afterwards reuse them
+# until the next rebuild (every RELATED_INDEX_MAX_AGE_SECONDS).
+#
+# The arrays only ever grow at the end: add() writes past what readers can
+# see, growing into fresh arrays when full, and only then takes the lock to
+# publish the new sizes. A lookup holds the lock just long enough to take
+# views of the arrays, so neither a resize nor the scoring runs under it.
+#
+# A rebuild scans every idea and takes seconds on a large table, so requests
+# never wait for one: a stale index keeps answering while a single background
+# thread builds its replacement, which is swapped in under the lock. The
+# first build starts with the application (app/startup.py); until it lands
+# /related answers from whatever has been added since.
+import logging
+import threading
+import time
+import zlib
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import settings
+from app.database import SessionLocal
+from app.search import search_terms
+
+logger = logging.getLogger("app.similarity")
+
+
+def _grown(a: np.ndarray, used: int, needed: int) -> np.ndarray:
+    """`a` if it holds `needed` entries, else a copy of its first `used` with room to spare."""
+    if needed <= len(a):
+        return a
+    out = np.empty(max(16, needed, 2 * len(a)), dtype=a.dtype)
+    out[:used] = a[:used]
+    return out
+
+
+class SimilarityIndex:
+    def __init__(self, dim: int):
+        self.dim = dim
+        # guards the published sizes, _pos and _late; held only briefly
+        self._lock = threading.Lock()
+        # serialises add() and the swap in build(), which fill the arrays past the published sizes
+        self._writing = threading.Lock()
+        self.built_at: Optional[float] = None
+        self._idf = np.ones(dim, dtype=np.float32)
+        # row r is idea _ids[r] (-1 once re-added further on), its terms are
+        # _cols/_vals[_indptr[r]:_indptr[r + 1]]
+        self._ids = np.empty(0, dtype=np.int64)
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._cols = np.empty(0, dtype=np.int32)
+        self._vals = np.empty(0, dtype=np.float32)
+        self._rows = 0
+        self._nnz = 0
+        self._pos = {}
+        self._invalidated_at: Optional[float] = None
+        # ideas add()ed while a rebuild is reading the table, re-added after the swap
+        self._late: Optional[dict] = None
+
+    def __len__(self) -> int:
+        return len(self._pos)
+
+    def __contains__(self, idea_id: int) -> bool:
+        return idea_id in self._pos
+
+    @property
+    def stale(self) -> bool:
+        if self.built_at is None:
+            return True
+        if self._invalidated_at is not None and self._invalidated_at >= self.built_at:
+            return True
+        return time.monotonic() - self.built_at > settings.RELATED_INDEX_MAX_AGE_SECONDS
+
+    def mark_stale(self) -> None:
+        """Force a rebuild on next use, e.g. after a bulk import shifted the idf."""
+        self._invalidated_at = time.monotonic()
+
+    def _term_counts(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Sparse sublinear tf of `texts` as (indptr, cols, tf), cols ascending within a row."""
+        rows, cols, signs = [], [], []
+        for i, text in enumerate(texts):
+            for term in search_terms(text):
+                h = zlib.crc32(term.encode())
+                rows.append(i)
+                cols.append(h % self.dim)
+                signs.append(1.0 if h & 0x80000000 else -1.0)
+        indptr = np.zeros(len(texts) + 1, dtype=np.int64)
+        if not rows:
+            return indptr, np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        keys, inverse = np.unique(np.array(rows, dtype=np.int64) * self.dim + np.array(cols), return_inverse=True)
+        counts = np.bincount(inverse, weights=np.array(signs))
+        # opposite hash signs can cancel out
+        keys, counts = keys[counts != 0], counts[counts != 0]
+        np.cumsum(np.bincount(keys // self.dim, minlength=len(texts)), out=indptr[1:])
+        # sublinear tf, keeping the hash sign
+        tf = np.sign(counts) * np.log1p(np.abs(counts))
+        return indptr, (keys % self.dim).astype(np.int32), tf.astype(np.float32)
+
+    @staticmethod
+    def _text(title: str, description: str) -> str:
+        # title terms count twice
+        return f"{title or ''} {title or ''} {description or ''}"
+
+    @staticmethod
+    def _weigh(indptr: np.ndarray, cols: np.ndarray, tf: np.ndarray, idf: np.ndarray) -> np.ndarray:
+        values = tf * idf[cols]
+        row_of = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        norms = np.sqrt(np.bincount(row_of, weights=values * values, minlength=len(indptr) - 1))
+        norms[norms == 0] = 1.0
+        return (values / norms[row_of]).astype(np.float32)
+
+    def begin_build(self) -> float:
+        """Call before reading the docs for build(); returns the `started` to pass it."""
+        with self._lock:
+            self._late = {}
+        return time.monotonic()
+
+    def build(self, docs: Iterable[Tuple[int, str, str]], started: Optional[float] = None) -> None:
+        """Replace the index with `docs` given as (idea_id, title, description).
+
+        Ideas add()ed since begin_build() are kept; the index counts as built
+        at `started`, so a mark_stale() during the read still triggers the next rebuild.
+        """
+        started = time.monotonic() if started is None else started
+        docs = list(docs)
+        indptr, cols, tf = self._term_counts([self._text(t, d) for _, t, d in docs])
+        df = np.bincount(cols, minlength=self.dim)
+        idf = (np.log((1 + len(docs)) / (1 + df)) + 1).astype(np.float32)
+        vals = self._weigh(indptr, cols, tf, idf)
+        ids = np.array([i for i, _, _ in docs], dtype=np.int64)
+        with self._writing, self._lock:
+            self._idf = idf
+            self._ids, self._indptr, self._cols, self._vals = ids, indptr, cols, vals
+            self._rows, self._nnz = len(docs), len(cols)
+            self._pos = {int(i): n for n, i in enumerate(ids)}
+            self.built_at = started
+            late, self._late = self._late or {}, None
+        for idea_id, (title, description) in late.items():
+            if idea_id not in self._pos:
+                self.add(idea_id, title, description)
+
+    def add(self, idea_id: int, title: str, description: str) -> None:
+        """Index an idea, or replace its vector by appending a new row and retiring the old one."""
+        indptr, cols, tf = self._term_counts([self._text(title, description)])
+        with self._writing:
+            vals = self._weigh(indptr, cols, tf, self._idf)
+            n, nnz = self._rows, self._nnz
+            ids = _grown(self._ids, n, n + 1)
+            offsets = _grown(self._indptr, n + 1, n + 2)
+            all_cols = _grown(self._cols, nnz, nnz + len(cols))
+            all_vals = _grown(self._vals, nnz, nnz + len(vals))
+            # past the published sizes, so readers of these same arrays don't see it yet
+            ids[n] = idea_id
+            offsets[n + 1] = nnz + len(cols)
+            all_cols[nnz:nnz + len(cols)] = cols
+            all_vals[nnz:nnz + len(vals)] = vals
+            with self._lock:
+                if self._late is not None:
+                    self._late[idea_id] = (title, description)
+                old = self._pos.get(idea_id)
+                if old is not None:
+                    ids[old] = -1
+                self._ids, self._indptr, self._cols, self._vals = ids, offsets, all_cols, all_vals
+                self._rows, self._nnz = n + 1, nnz + len(cols)
+                self._pos[idea_id] = n
+
+    def related(self, idea_id: int, k: int) -> List[Tuple[int, float]]:
+        """Top-k (idea_id, cosine similarity) pairs for an indexed idea, best first."""
+        with self._lock:
+            n = self._pos.get(idea_id)
+            if n is None or len(self._pos) < 2:
+                return []
+            rows, nnz = self._rows, self._nnz
+            ids, indptr = self._ids[:rows], self._indptr[:rows + 1]
+            cols, vals = self._cols[:nnz], self._vals[:nnz]
+        query = np.zeros(self.dim, dtype=np.float32)
+        query[cols[indptr[n]:indptr[n + 1]]] = vals[indptr[n]:indptr[n + 1]]
+        # a trailing zero keeps reduceat's offsets in range when the last rows are empty
+        products = np.zeros(nnz + 1, dtype=np.float32)
+        np.multiply(vals, query[cols], out=products[:nnz])
+        sims = np.add.reduceat(products, indptr[:-1])
+        sims[indptr[:-1] == indptr[1:]] = 0.0
+        sims[ids < 0] = -np.inf
+        sims[n] = -np.inf
+        k = min(k, rows - 1)
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top])]
+        return [(int(ids[i]), float(sims[i])) for i in top if sims[i] > 0 and ids[i] >= 0]
+
+
+index = SimilarityIndex(settings.RELATED_VECTOR_DIM)
+_rebuilding = threading.Lock()
+
+
+def rebuild(db: Session, batch_size: int = 5000) -> None:
+    started = index.begin_build()
+    docs = []
+    last_id = 0
+    q = select(models.Idea.id, models.Idea.title, models.Idea.description).order_by(models.Idea.id).limit(batch_size)
+    while True:
+        rows = db.execute(q.where(models.Idea.id > last_id)).all()
+        if not rows:
+            break
+        docs.extend((r.id, r.title, r.description) for r in rows)
+        last_id = rows[-1].id
+    index.build(docs, started)
+
+
+def refresh() -> bool:
+    """Rebuild the index in a session of its own unless a rebuild is already running; True if this call rebuilt it."""
+    if not _rebuilding.acquire(blocking=False):
+        return False
+    db = SessionLocal()
+    try:
+        rebuild(db)
+        return True
+    except Exception:
+        logger.exception("Related ideas index rebuild failed")
+        return False
+    finally:
+        db.close()
+        _rebuilding.release()
+
+
+def refresh_in_background() -> None:
+    if not _rebuilding.locked():
+        threading.Thread(target=refresh, name="related-index", daemon=True).start()
+
+
+def related_ideas(db: Session, idea_id: int, k: int) -> List[Tuple[int, float]]:
+    if index.stale:
+        # answer from the current index; the rebuild swaps in when it is done
+        refresh_in_background()
+    if idea_id not in index:
+        # created on another worker since our last build
+        row = db.execute(
+            select(models.Idea.title, models.Idea.description).where(models.Idea.id == idea_id)
+        ).first()
+        if row:
+            index.add(idea_id, row.title, row.description)
+    return index.related(idea_id, k)
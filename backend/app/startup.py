@@ -0,0 +1,163 @@
+# backend/app/startup.py
+# Application lifespan: warm-up before serving, draining on shutdown.
+#
+# Importing app.main touches nothing outside the process; the schema belongs
+# to Alembic (DB_CREATE_ALL is a dev/test shortcut). The warm-up here opens
+# the pool's first connections and loads the category catalogue, so the
+# first requests don't pay for either. The related-ideas index is built on a
+# background thread afterwards; neither readiness nor any request waits for
+# it. /readyz reports 503 until the warm-up has succeeded (retrying it when
+# it failed, e.g. because the migrations had not run yet) and whenever the
+# database stops answering; /healthz only says the process is up.
+import asyncio
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from app import database, models
+from app.category_cache import category_cache
+from app.core.config import settings
+from app.metrics import registry
+from app.vote_buffer import vote_buffer
+
+logger = logging.getLogger("app.startup")
+
+
+class StartupState:
+    def __init__(self):
+        self.ready = False
+        self.error: Optional[str] = None  # why the last warm-up failed
+        self.timings: Dict[str, float] = {}
+        self.import_started: Optional[float] = None
+
+
+state = StartupState()
+_retrying = asyncio.Lock()
+
+
+def _prefill_pool(count: int) -> int:
+    """Open `count` connections and hand them back, leaving them idle in the pool."""
+    connections = []
+    try:
+        for _ in range(count):
+            connections.append(database.engine.connect())
+    finally:
+        for conn in connections:
+            conn.close()
+    return len(connections)
+
+
+async def _prefill_async_pool(count: int) -> int:
+    connections = [database.async_engine.connect() for _ in range(count)]
+    try:
+        await asyncio.gather(*(conn.start() for conn in connections))
+    finally:
+        for conn in connections:
+            await conn.close()
+    return len(connections)
+
+
+def warm_up() -> None:
+    if settings.DB_CREATE_ALL:
+        models.Base.metadata.create_all(bind=database.engine)
+    prefill = max(0, min(settings.DB_POOL_PREFILL, settings.DB_POOL_SIZE))
+    if prefill:
+        _prefill_pool(prefill)
+    db = database.SessionLocal()
+    try:
+        category_cache.snapshot(db)
+    finally:
+        db.close()
+
+
+async def _warm_up_all() -> None:
+    await run_in_threadpool(warm_up)
+    prefill = max(0, min(settings.DB_POOL_PREFILL, settings.DB_POOL_SIZE))
+    if database.async_engine is not None and prefill:
+        await _prefill_async_pool(prefill)
+
+
+def _build_related_index() -> None:
+    # imported here so numpy stays off the import path of app.main
+    from app import similarity
+    similarity.refresh()
+
+
+def _became_ready() -> None:
+    state.error = None
+    state.ready = True
+    threading.Thread(target=_build_related_index, name="related-index", daemon=True).start()
+
+
+def _failed(e: Exception) -> None:
+    logger.exception("Startup warm-up failed")
+    first_line = (str(e).splitlines() or [""])[0]
+    state.error = f"{type(e).__name__}: {first_line[:200]}"
+
+
+async def retry_warm_up() -> bool:
+    """Run the warm-up again after it failed; True once the application is ready.
+
+    Called by /readyz. A retry already in progress is not waited for.
+    """
+    if state.ready:
+        return True
+    if _retrying.locked():
+        return False
+    async with _retrying:
+        try:
+            await _warm_up_all()
+        except Exception as e:
+            _failed(e)
+            return False
+        state.timings["import_to_ready"] = time.perf_counter() - state.import_started
+        registry.record_startup("import_to_ready", state.timings["import_to_ready"])
+        _became_ready()
+        logger.info("Ready after retrying the warm-up")
+        return True
+
+
+def check_database() -> None:
+    with database.engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+def lifespan(import_started: float):
+    """Lifespan handler for FastAPI; `import_started` is a perf_counter() taken when app.main began importing."""
+
+    @asynccontextmanager
+    async def handler(app):
+        state.import_started = import_started
+        state.error = None
+        started = time.perf_counter()
+        try:
+            await _warm_up_all()
+        except Exception as e:
+            # stay up but not ready: /readyz retries the warm-up
+            _failed(e)
+        ready = time.perf_counter()
+        state.timings = {"import": started - import_started, "warm_up": ready - started}
+        if state.error is None:
+            state.timings["import_to_ready"] = ready - import_started
+        for phase, seconds in state.timings.items():
+            registry.record_startup(phase, seconds)
+        if state.error is None:
+            _became_ready()
+            logger.info("Ready in %.3fs (import %.3fs, warm-up %.3fs)",
+                        state.timings["import_to_ready"], state.timings["import"], state.timings["warm_up"])
+        try:
+            yield
+        finally:
+            state.ready = False
+            # write-behind votes still buffered in this worker
+            await run_in_threadpool(vote_buffer.stop)
+            if database.async_engine is not None:
+                await database.async_engine.dispose()
+            database.engine.dispose()
+
+    return handler
@@ -0,0 +1,117 @@
+# backend/app/transitions.py
+# Idea status changes for the Kanban boards, single or batched.
+#
+# A batch is one transaction: the targeted rows are read (and locked) in one
+# SELECT, permissions are decided from that read, and each target status gets
+# a single UPDATE ... WHERE (id, version) IN (...). Every applied change bumps
+# ideas.version; a client that sends the version it last saw gets a 409 if
+# someone else moved the card in between, and nothing in the batch is applied.
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app import models, reports
+from app.changes import bump_ideas
+from app.principal_cache import Principal
+
+STATUSES = ("Submitted", "Under Review", "Approved", "In Progress", "Implemented", "Archived")
+_CANONICAL = {s.lower(): s for s in STATUSES}
+# may move any idea; everyone else only their own
+REVIEWER_ROLES = ("admin", "evaluator")
+MAX_BATCH = 500
+
+Change = Tuple[int, str, Optional[int]]  # (idea id, target status, expected version)
+
+
+def canonical_status(value: str) -> str:
+    canonical = _CANONICAL.get((value or "").strip().lower())
+    if canonical is None:
+        raise HTTPException(status_code=400, detail=f"Unknown status {value!r}; expected one of {', '.join(STATUSES)}")
+    return canonical
+
+
+def apply_status_changes(db: Session, changes: Sequence[Change], user: Principal) -> List[dict]:
+    """Apply all `changes` or none; returns {id, status, version} per change, in order."""
+    if not changes:
+        return []
+    if len(changes) > MAX_BATCH:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH} changes per request")
+    ids = [c[0] for c in changes]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=400, detail="Each idea may appear only once per request")
+    targets = {idea_id: canonical_status(target) for idea_id, target, _ in changes}
+
+    Idea = models.Idea
+    current = {
+        r.id: r
+        for r in db.execute(
+            select(Idea.id, Idea.owner_id, Idea.status, Idea.version).where(Idea.id.in_(ids)).with_for_update()
+        )
+    }
+    missing = [i for i in ids if i not in current]
+    if missing:
+        db.rollback()
+        raise HTTPException(status_code=404, detail={"message": "Idea not found", "ids": missing})
+
+    if not any(r in (user.roles or []) for r in REVIEWER_ROLES):
+        foreign = [i for i in ids if current[i].owner_id != user.id]
+        if foreign:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail={"message": "Only reviewers can move other users' ideas", "ids": foreign},
+            )
+
+    stale = [
+        {"id": i, "status": current[i].status, "version": current[i].version}
+        for i, _, expected in changes
+        if expected is not None and expected != current[i].version
+    ]
+    if stale:
+        db.rollback()
+        raise _conflict(stale)
+
+    by_target: Dict[str, List[Tuple[int, int]]] = {}
+    for i in ids:
+        if current[i].status != targets[i]:
+            by_target.setdefault(targets[i], []).append((i, current[i].version))
+
+    now = datetime.utcnow()
+    try:
+        for target, pairs in by_target.items():
+            reports.move_status(db, [i for i, _ in pairs], target)
+            result = db.execute(
+                update(Idea)
+                .where(tuple_(Idea.id, Idea.version).in_(pairs))
+                .values(status=target, version=Idea.version + 1, revision=Idea.revision + 1, updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            # the version guard catches writers that got in after our read where
+            # the SELECT could not lock (SQLite)
+            if result.rowcount != len(pairs):
+                db.rollback()
+                raise _conflict([{"id": i} for i, _ in pairs])
+        if by_target:
+            bump_ideas(db)
+        db.commit()
+    except HTTPException:
+        raise
+    except Exception:
+        db.rollback()
+        raise
+
+    moved = {i for pairs in by_target.values() for i, _ in pairs}
+    return [
+        {"id": i, "status": targets[i], "version": current[i].version + (1 if i in moved else 0)}
+        for i in ids
+    ]
+
+
+def _conflict(ideas: List[dict]) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={"message": "Idea was changed by someone else; reload and retry", "ideas": ideas},
+    )
@@ -0,0 +1,62 @@
+# backend/app/trending.py
+# Time-decayed "hot" ranking stored on ideas.hot_score.
+#
+# The score is log10 of the net engagement plus the idea's age offset, so an
+# idea needs 10x the engagement to outrank one posted TRENDING_DECAY_SECONDS
+# later. Because the age term is fixed at creation time the ordering never
+# goes stale: it only has to be refreshed when an idea's counters change, and
+# recomputed in bulk when the trending settings themselves change.
+import math
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm import Session
+
+from app import changes, models
+from app.core.config import settings
+
+EPOCH = datetime(2025, 1, 1)
+
+
+def hot_score(upvotes: int, downvotes: int, comments_count: int, created_at: Optional[datetime]) -> float:
+    s = (upvotes or 0) - (downvotes or 0) + settings.TRENDING_COMMENT_WEIGHT * (comments_count or 0)
+    order = math.log10(max(abs(s), 1))
+    sign = 1 if s > 0 else -1 if s < 0 else 0
+    age = ((created_at or datetime.utcnow()) - EPOCH).total_seconds()
+    return round(sign * order + age / settings.TRENDING_DECAY_SECONDS, 7)
+
+
+def recompute_hot_scores(db: Session, idea_ids: Optional[Iterable[int]] = None, batch_size: int = 1000) -> int:
+    """Rewrite hot_score from the stored counters, for all ideas or just `idea_ids`.
+
+    Walks the table in id order one batch at a time and writes each batch
+    with a single executemany.
+    """
+    q = select(
+        models.Idea.id, models.Idea.upvotes, models.Idea.downvotes, models.Idea.comments_count, models.Idea.created_at
+    ).order_by(models.Idea.id).limit(batch_size)
+    if idea_ids is not None:
+        q = q.where(models.Idea.id.in_(list(idea_ids)))
+    stmt = (
+        update(models.Idea.__table__)
+        .where(models.Idea.__table__.c.id == bindparam("b_id"))
+        .values(hot_score=bindparam("b_hot"))
+    )
+
+    total = 0
+    last_id = 0
+    while True:
+        rows = db.execute(q.where(models.Idea.id > last_id)).all()
+        if not rows:
+            break
+        db.execute(stmt, [
+            {"b_id": r.id, "b_hot": hot_score(r.upvotes, r.downvotes, r.comments_count, r.created_at)}
+            for r in rows
+        ])
+        # trending listings reorder without any idea changing
+        changes.bump_ideas(db)
+        db.commit()
+        total += len(rows)
+        last_id = rows[-1].id
+    return total
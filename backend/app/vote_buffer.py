@@ -0,0 +1,234 @@
+# backend/app/vote_buffer.py
+# Write-behind vote ingestion (VOTE_WRITE_BEHIND).
+#
+# A burst of votes on one idea would otherwise queue on that idea's row lock,
+# one transaction per vote. Instead the vote endpoint drops the vote into this
+# per-worker buffer and answers with a provisional count; a background thread
+# flushes the buffer every VOTE_FLUSH_INTERVAL_SECONDS. Only the latest vote
+# per (idea, user) is kept, and a flush writes a chunk of votes with one
+# executemany upsert, one counter update per idea and one summary upsert, in
+# a single transaction. The flush recomputes deltas from the votes table under
+# the idea row locks, so the stored counters stay exact whatever the
+# provisional answers said. stop() drains the buffer on shutdown; votes still
+# buffered when a worker is killed outright are lost.
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import bindparam, select, tuple_, update
+
+from app import changes, counters, models, reports
+from app.core.config import settings
+from app.database import SessionLocal
+from app.events import hub, idea_channel
+from app.trending import hot_score
+
+logger = logging.getLogger("app.vote_buffer")
+
+Key = Tuple[int, int]  # (idea id, user id)
+Entry = Tuple[str, Optional[str]]  # (requested type, the user's stored type when first buffered)
+
+
+def _buffer_full() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many votes in progress, try again shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+class VoteBuffer:
+    def __init__(self, maxsize: int, interval: float, batch_size: int):
+        self.maxsize = maxsize
+        self.interval = interval
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: Dict[Key, Entry] = {}
+        # provisional (up, down) per idea, for votes buffered or being flushed
+        self._deltas: Dict[int, List[int]] = {}
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _shift(self, idea_id: int, entry: Entry, sign: int) -> None:
+        up, down = counters.vote_deltas(entry[1], entry[0])
+        d = self._deltas.setdefault(idea_id, [0, 0])
+        d[0] += sign * up
+        d[1] += sign * down
+        if d == [0, 0]:
+            del self._deltas[idea_id]
+
+    def add(self, idea_id: int, user_id: int, vote_type: str, stored: Optional[str]) -> Tuple[int, int]:
+        """Buffer a vote; returns the idea's provisional (up, down) offset from its stored counters.
+
+        `stored` is the user's vote as currently in the votes table. Raises
+        503 when the buffer is full or shutting down.
+        """
+        key = (idea_id, user_id)
+        with self._lock:
+            if self._stopping.is_set():
+                raise _buffer_full()
+            previous = self._pending.get(key)
+            if previous is None and len(self._pending) >= self.maxsize:
+                self._wake.set()
+                raise _buffer_full()
+            if previous is not None:
+                self._shift(idea_id, previous, -1)
+                stored = previous[1]
+            entry = (vote_type, stored)
+            self._pending[key] = entry
+            self._shift(idea_id, entry, 1)
+            offset = tuple(self._deltas.get(idea_id, (0, 0)))
+            if len(self._pending) >= self.batch_size:
+                self._wake.set()
+        self._ensure_started()
+        return offset
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None and not self._stopping.is_set():
+                    self._thread = threading.Thread(target=self._run, name="vote-flusher", daemon=True)
+                    self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Vote flush failed")
+
+    def flush(self) -> int:
+        """Write everything buffered so far; returns the number of votes flushed."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            items = list(batch.items())
+            done = 0
+            for i in range(0, len(items), self.batch_size):
+                chunk = items[i:i + self.batch_size]
+                try:
+                    self._write(chunk)
+                except Exception:
+                    self._requeue(items[i:])
+                    raise
+                with self._lock:
+                    for (idea_id, _), entry in chunk:
+                        self._shift(idea_id, entry, -1)
+                done += len(chunk)
+            return done
+
+    def _requeue(self, items: List[Tuple[Key, Entry]]) -> None:
+        with self._lock:
+            for key, entry in items:
+                newer = self._pending.get(key)
+                if newer is None:
+                    self._pending[key] = entry
+                else:
+                    # the newer vote replaces this one; its provisional offset was
+                    # taken against the same stored type
+                    self._shift(key[0], entry, -1)
+
+    def _write(self, chunk: List[Tuple[Key, Entry]]) -> None:
+        Idea, Vote = models.Idea, models.Vote
+        db = SessionLocal()
+        try:
+            idea_ids = sorted({idea_id for (idea_id, _), _ in chunk})
+            ideas = {
+                r.id: r
+                for r in db.execute(
+                    select(
+                        Idea.id, Idea.upvotes, Idea.downvotes, Idea.comments_count,
+                        Idea.created_at, Idea.category_id, Idea.status,
+                    )
+                    .where(Idea.id.in_(idea_ids))
+                    .order_by(Idea.id)
+                    .with_for_update()
+                )
+            }
+            # votes on ideas deleted since they were buffered are dropped
+            chunk = [(key, entry) for key, entry in chunk if key[0] in ideas]
+            stored = {
+                (r.idea_id, r.user_id): r
+                for r in db.execute(
+                    select(Vote.idea_id, Vote.user_id, Vote.type, Vote.created_at)
+                    .where(tuple_(Vote.idea_id, Vote.user_id).in_([key for key, _ in chunk]))
+                )
+            } if chunk else {}
+
+            now = datetime.utcnow()
+            changed, recorded = [], []
+            totals = {idea_id: [ideas[idea_id].upvotes, ideas[idea_id].downvotes] for idea_id in ideas}
+            for (idea_id, user_id), (vote_type, _) in chunk:
+                existing = stored.get((idea_id, user_id))
+                up, down = counters.vote_deltas(existing.type if existing else None, vote_type)
+                if not up and not down:
+                    continue
+                changed.append((idea_id, user_id, vote_type))
+                # a changed vote keeps its original created_at, so it stays on that day
+                recorded.append((ideas[idea_id], existing.created_at if existing else now, up, down))
+                totals[idea_id][0] += up
+                totals[idea_id][1] += down
+            touched = {idea_id for idea_id, _, _ in changed}
+            if not touched:
+                db.rollback()
+                return
+
+            counters.upsert_votes(db, changed)
+            ideas_table = Idea.__table__
+            db.execute(
+                update(ideas_table)
+                .where(ideas_table.c.id == bindparam("b_id"))
+                .values(upvotes=bindparam("b_up"), downvotes=bindparam("b_down"),
+                        score=bindparam("b_score"), hot_score=bindparam("b_hot"),
+                        revision=ideas_table.c.revision + 1),
+                [
+                    {"b_id": idea_id, "b_up": up, "b_down": down, "b_score": float(up - down),
+                     "b_hot": hot_score(up, down, ideas[idea_id].comments_count, ideas[idea_id].created_at)}
+                    for idea_id, (up, down) in totals.items() if idea_id in touched
+                ],
+            )
+            reports.record_votes(db, recorded)
+            changes.bump_ideas(db)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        for idea_id in sorted(touched):
+            up, down = totals[idea_id]
+            hub.publish(idea_channel(idea_id), "vote", {
+                "idea_id": idea_id, "upvotes": up, "downvotes": down,
+                "votes": up + down, "score": float(up - down),
+            })
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Stop accepting votes and flush what is buffered; call on shutdown."""
+        with self._lock:
+            self._stopping.set()
+            thread = self._thread
+        self._wake.set()
+        if thread is not None:
+            thread.join(timeout)
+        try:
+            flushed = self.flush()
+        except Exception:
+            logger.exception("Vote flush on shutdown failed; %d votes not written", self.pending_count())
+            return
+        if flushed:
+            logger.info("Flushed %d buffered votes on shutdown", flushed)
+
+
+vote_buffer = VoteBuffer(settings.VOTE_BUFFER_SIZE, settings.VOTE_FLUSH_INTERVAL_SECONDS,
+                         settings.VOTE_FLUSH_BATCH_SIZE)
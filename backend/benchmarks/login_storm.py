@@ -0,0 +1,99 @@
+"""Idea-read latency during a login storm.
+
+Runs the app in-process over ASGI against a throwaway SQLite database,
+measures GET /api/ideas/ latency on its own, then again while a burst of
+concurrent logins is hashing passwords. Needs httpx.
+
+    cd backend && python -m benchmarks.login_storm --logins 200 --concurrency 50
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+
+def _pct(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))] * 1000
+
+
+async def _read_ideas(client, n, latencies):
+    for _ in range(n):
+        t = time.perf_counter()
+        r = await client.get("/api/ideas/", params={"limit": 20})
+        r.raise_for_status()
+        latencies.append(time.perf_counter() - t)
+
+
+async def _login(client, sem, i, users, results):
+    async with sem:
+        r = await client.post("/api/auth/login", json={"email": f"user{i % users}@ignite-bench.com", "password": "benchpass"})
+        results.append(r.status_code)
+
+
+async def run(args):
+    import httpx
+    from sqlalchemy import insert
+    from app.main import app
+    from app.database import engine
+    from app.core.security import hash_password
+    from app import models
+
+    # importing the app creates no tables (schema is Alembic's); the throwaway database needs them
+    models.Base.metadata.create_all(engine)
+    hashed = hash_password("benchpass")
+    with engine.begin() as conn:
+        conn.execute(insert(models.User), [
+            {"id": i + 1, "name": f"User {i}", "email": f"user{i}@ignite-bench.com", "hashed_password": hashed}
+            for i in range(args.users)
+        ])
+        conn.execute(insert(models.UserRole), [{"user_id": i + 1, "role": "user"} for i in range(args.users)])
+        conn.execute(insert(models.Category), [{"name": "Bench"}])
+        conn.execute(insert(models.Idea), [
+            {"title": f"Idea {i}", "description": "benchmark idea", "category_id": 1, "owner_id": 1, "status": "Submitted"}
+            for i in range(args.ideas)
+        ])
+
+    transport = httpx.ASGITransport(app=app)
+    # ASGITransport skips the lifespan; run it so the app warms up and its engines are disposed at the end
+    async with app.router.lifespan_context(app), \
+            httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        baseline = []
+        await _read_ideas(client, args.reads, baseline)
+
+        during, statuses = [], []
+        sem = asyncio.Semaphore(args.concurrency)
+        t = time.perf_counter()
+        storm = asyncio.gather(*[_login(client, sem, i, args.users, statuses) for i in range(args.logins)])
+        await asyncio.gather(storm, _read_ideas(client, args.reads, during))
+        elapsed = time.perf_counter() - t
+
+    ok = statuses.count(200)
+    print(f"idea reads alone:        p50 {_pct(baseline, 0.5):7.1f} ms  p95 {_pct(baseline, 0.95):7.1f} ms")
+    print(f"idea reads during storm: p50 {_pct(during, 0.5):7.1f} ms  p95 {_pct(during, 0.95):7.1f} ms")
+    print(f"max read during storm: {max(during) * 1000:.1f} ms")
+    print(f"logins: {ok} ok, {statuses.count(503)} shed (503), {ok / elapsed:.1f} logins/s, "
+          f"mean read slowdown x{statistics.mean(during) / statistics.mean(baseline):.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--ideas", type=int, default=500)
+    parser.add_argument("--reads", type=int, default=100)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(prefix="ignite-bench-"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    # slow-request logging would otherwise flood the output during the storm
+    logging.getLogger("app.metrics").setLevel(logging.ERROR)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""Load benchmark for the main API paths.
+
+Drives list_ideas, get_idea, list_comments, vote and login in-process
+through the ASGI app (httpx, no network) with a fixed number of requests
+per scenario at a given concurrency, and reports throughput and
+p50/p95/p99 latency. Results can be saved as a JSON baseline and later
+runs compared against it; a p95 or throughput regression beyond
+--tolerance makes the run exit non-zero. Needs httpx.
+
+    cd backend
+    python -m benchmarks.run --fresh --ideas 100000 --votes 1000000 --comments 500000 --users 10000 \\
+        --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run --database-url sqlite:////tmp/ignite-bench.db --baseline benchmarks/baseline.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.seed import BENCH_PASSWORD, add_volume_args, bench_email
+
+SCENARIOS = ("list_ideas", "get_idea", "list_comments", "vote", "login")
+
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+def summarize(latencies, errors, elapsed):
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+async def drive(make_request, n, concurrency):
+    latencies, errors = [], 0
+    queue = iter(range(n))
+
+    async def worker():
+        nonlocal errors
+        for i in queue:
+            t = time.perf_counter()
+            r = await make_request(i)
+            latencies.append(time.perf_counter() - t)
+            if r.status_code >= 400:
+                errors += 1
+
+    t = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return summarize(latencies, errors, time.perf_counter() - t)
+
+
+async def run_scenarios(args, volumes):
+    import httpx
+    from app.main import app
+    from app.core.security import create_access_token
+
+    rng = random.Random(args.seed)
+    ideas, users, categories = volumes["ideas"], volumes["users"], volumes["categories"]
+    tokens = [create_access_token(subject=rng.randint(1, users)) for _ in range(200)]
+
+    def list_ideas(client):
+        def req(i):
+            params = rng.choice([{}, {"category_id": rng.randint(1, categories)}, {"status": "Submitted"}, {"trending": "true"}])
+            return client.get("/api/ideas/", params={"limit": 50, **params})
+        return req
+
+    def get_idea(client):
+        return lambda i: client.get(f"/api/ideas/{rng.randint(1, ideas)}")
+
+    def list_comments(client):
+        return lambda i: client.get(f"/api/ideas/{rng.randint(1, ideas)}/comments")
+
+    def vote(client):
+        return lambda i: client.post(
+            f"/api/ideas/{rng.randint(1, ideas)}/vote",
+            json={"type": rng.choice(["up", "up", "down"])},
+            headers={"Authorization": f"Bearer {rng.choice(tokens)}"},
+        )
+
+    def login(client):
+        return lambda i: client.post(
+            "/api/auth/login", json={"email": bench_email(rng.randint(0, users - 1)), "password": BENCH_PASSWORD}
+        )
+
+    builders = {"list_ideas": list_ideas, "get_idea": get_idea, "list_comments": list_comments, "vote": vote, "login": login}
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    # ASGITransport skips the lifespan; run it so the app warms up and its engines are disposed at the end
+    async with app.router.lifespan_context(app), \
+            httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        for name in args.scenarios:
+            n = args.login_requests if name == "login" else args.requests
+            # warm caches and the pool so the first requests don't skew the percentiles
+            await drive(builders[name](client), min(n, args.concurrency), args.concurrency)
+            results[name] = await drive(builders[name](client), n, args.concurrency)
+            r = results[name]
+            print(f"{name:<14} {r['requests']:>6} req  {r['throughput_rps']:>8.1f} req/s  "
+                  f"p50 {r['p50_ms']:>8.2f} ms  p95 {r['p95_ms']:>8.2f} ms  p99 {r['p99_ms']:>8.2f} ms  "
+                  f"errors {r['errors']}")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Regression messages for scenarios that got slower than the baseline allows."""
+    problems = []
+    for name, r in results.items():
+        b = baseline.get("results", {}).get(name)
+        if not b:
+            continue
+        if b["p95_ms"] and r["p95_ms"] > b["p95_ms"] * (1 + tolerance):
+            problems.append(f"{name}: p95 {r['p95_ms']} ms vs baseline {b['p95_ms']} ms")
+        if b["throughput_rps"] and r["throughput_rps"] < b["throughput_rps"] * (1 - tolerance):
+            problems.append(f"{name}: {r['throughput_rps']} req/s vs baseline {b['throughput_rps']} req/s")
+        if r["errors"] > b.get("errors", 0):
+            problems.append(f"{name}: {r['errors']} errors vs baseline {b.get('errors', 0)}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API load benchmark.")
+    parser.add_argument("--database-url", help="an already seeded database (see benchmarks.seed)")
+    parser.add_argument("--fresh", action="store_true", help="seed a throwaway SQLite database first")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario")
+    parser.add_argument("--login-requests", type=int, default=50, help="login is bcrypt-bound, so it gets fewer")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--baseline", help="compare against this JSON baseline")
+    parser.add_argument("--save-baseline", help="write results to this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression")
+    add_volume_args(parser)
+    args = parser.parse_args()
+
+    if not args.database_url and not args.fresh:
+        parser.error("pass --database-url of a seeded database, or --fresh")
+    if args.fresh and not args.database_url:
+        args.database_url = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="ignite-bench-"), "bench.db")
+    os.environ["DATABASE_URL"] = args.database_url
+    # slow-request logging would otherwise flood the output under load
+    logging.getLogger("app.metrics").setLevel(logging.ERROR)
+
+    volumes = {"users": args.users, "ideas": args.ideas, "votes": args.votes,
+               "comments": args.comments, "categories": args.categories}
+    if args.fresh:
+        from app.database import engine
+        from benchmarks.seed import seed
+        print(f"seeding {args.database_url}")
+        volumes = seed(engine, seed_value=args.seed, **volumes)
+
+    results = asyncio.run(run_scenarios(args, volumes))
+    report = {
+        "volumes": volumes,
+        "concurrency": args.concurrency,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"baseline written to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("volumes") != volumes:
+            print(f"warning: baseline volumes {baseline.get('volumes')} differ from this run's {volumes}")
+        problems = compare(results, baseline, args.tolerance)
+        for p in problems:
+            print(f"REGRESSION {p}")
+        if problems:
+            sys.exit(1)
+        print("no regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Seed a benchmark database with bulk inserts.
+
+Volumes are configurable and generation is deterministic for a given
+--seed, so runs against the same volumes are comparable. Stored counters
+(upvotes, downvotes, comments_count, hot_score) are computed while
+generating, so the seeded rows look as if they had gone through the API.
+
+    cd backend && python -m benchmarks.seed --database-url sqlite:////tmp/ignite-bench.db \\
+        --users 10000 --ideas 100000 --votes 1000000 --comments 500000
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+BENCH_PASSWORD = "benchpass"
+BENCH_EMAIL_DOMAIN = "ignite-bench.com"
+WORDS = (
+    "solar coffee roof energy office remote travel budget printer kitchen parking bike meeting cloud data "
+    "security onboarding recycling lighting training wellness badge cafeteria shuttle laptop network backup "
+    "invoice supplier warehouse forecast dashboard survey mentoring hiring carbon water paper waste noise"
+).split()
+
+
+def bench_email(i: int) -> str:
+    return f"user{i}@{BENCH_EMAIL_DOMAIN}"
+
+
+def _chunks(rows, size):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def seed(engine, users=1000, ideas=10000, votes=100000, comments=50000, categories=10, seed_value=42,
+         batch_size=10000, log=print):
+    """Create the schema on `engine` and fill it; returns the volumes inserted."""
+    from sqlalchemy import insert
+    from app import models
+    import app.search  # noqa: F401  (registers the SQLite FTS5 DDL)
+    from app.core.security import hash_password
+    from app.trending import hot_score
+    from app.transitions import STATUSES
+
+    rng = random.Random(seed_value)
+    models.Base.metadata.create_all(bind=engine)
+    hashed = hash_password(BENCH_PASSWORD)
+    now = datetime.utcnow()
+
+    def bulk(model, rows):
+        t = time.perf_counter()
+        with engine.begin() as conn:
+            for chunk in _chunks(rows, batch_size):
+                conn.execute(insert(model), chunk)
+        log(f"  {model.__tablename__:<11} {len(rows):>9} rows in {time.perf_counter() - t:6.1f}s")
+
+    bulk(models.Category, [{"id": i + 1, "name": f"Category {i + 1}"} for i in range(categories)])
+    bulk(models.User, [
+        {"id": i + 1, "name": f"User {i}", "email": bench_email(i), "hashed_password": hashed, "created_at": now}
+        for i in range(users)
+    ])
+    bulk(models.UserRole, [{"user_id": i + 1, "role": "admin" if i == 0 else "user"} for i in range(users)])
+
+    # votes: unique (idea, user) pairs
+    ups = [0] * (ideas + 1)
+    downs = [0] * (ideas + 1)
+    votes = min(votes, ideas * users)
+    seen = set()
+    vote_rows = []
+    while len(vote_rows) < votes:
+        idea_id = rng.randint(1, ideas)
+        user_id = rng.randint(1, users)
+        key = idea_id * (users + 1) + user_id
+        if key in seen:
+            continue
+        seen.add(key)
+        kind = "up" if rng.random() < 0.8 else "down"
+        if kind == "up":
+            ups[idea_id] += 1
+        else:
+            downs[idea_id] += 1
+        vote_rows.append({"idea_id": idea_id, "user_id": user_id, "type": kind, "created_at": now})
+    del seen
+
+    comment_counts = [0] * (ideas + 1)
+    comment_rows = []
+    for _ in range(comments):
+        idea_id = rng.randint(1, ideas)
+        comment_counts[idea_id] += 1
+        comment_rows.append({
+            "idea_id": idea_id, "user_id": rng.randint(1, users),
+            "content": " ".join(rng.choices(WORDS, k=rng.randint(5, 30))),
+            "created_at": now - timedelta(seconds=rng.randint(0, 86400 * 30)),
+        })
+
+    idea_rows = []
+    for i in range(1, ideas + 1):
+        created = now - timedelta(seconds=rng.randint(0, 86400 * 365))
+        idea_rows.append({
+            "id": i,
+            "title": " ".join(rng.sample(WORDS, 4)).capitalize(),
+            "description": " ".join(rng.choices(WORDS, k=rng.randint(20, 80))),
+            "category_id": rng.randint(1, categories),
+            "owner_id": rng.randint(1, users),
+            "status": rng.choice(STATUSES),
+            "upvotes": ups[i],
+            "downvotes": downs[i],
+            "comments_count": comment_counts[i],
+            "score": float(ups[i] - downs[i]),
+            "hot_score": hot_score(ups[i], downs[i], comment_counts[i], created),
+            "created_at": created,
+            "updated_at": created,
+        })
+    bulk(models.Idea, idea_rows)
+    bulk(models.Vote, vote_rows)
+    bulk(models.Comment, comment_rows)
+
+    from sqlalchemy.orm import Session
+    from app.reports import rebuild
+    t = time.perf_counter()
+    with Session(engine) as db:
+        n = rebuild(db)
+    log(f"  {'daily_summary':<11} {n:>9} rows in {time.perf_counter() - t:6.1f}s")
+    return {"categories": categories, "users": users, "ideas": ideas, "votes": len(vote_rows), "comments": comments}
+
+
+def add_volume_args(parser):
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--ideas", type=int, default=10000)
+    parser.add_argument("--votes", type=int, default=100000)
+    parser.add_argument("--comments", type=int, default=50000)
+    parser.add_argument("--categories", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a benchmark database.")
+    parser.add_argument("--database-url", required=True, help="e.g. sqlite:////tmp/ignite-bench.db or a MySQL URL")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    add_volume_args(parser)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.database_url
+    from app.database import engine
+
+    t = time.perf_counter()
+    volumes = seed(engine, users=args.users, ideas=args.ideas, votes=args.votes, comments=args.comments,
+                   categories=args.categories, seed_value=args.seed, batch_size=args.batch_size)
+    print(f"seeded {volumes} in {time.perf_counter() - t:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
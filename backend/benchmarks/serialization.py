@@ -0,0 +1,101 @@
+"""Microbenchmark for idea and comment response serialization.
+
+Times the per-item cost of turning a page of listing dicts into JSON
+bytes two ways: the old route path (parse_obj_as in the handler, then
+FastAPI's response_model validation and JSONResponse encoding) and
+app.serialization.encode(). No database is involved.
+
+    cd backend
+    python -m benchmarks.serialization --pages 50 500
+"""
+import argparse
+import time
+import warnings
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import parse_obj_as
+
+from app import schemas
+from app.serialization import encode
+
+
+def idea_item(i: int, now: datetime) -> dict:
+    return {
+        "id": i, "title": f"Idea {i}: shorter stand-ups", "description": "Cap stand-ups at ten minutes. " * 8,
+        "category_id": 1 + i % 5, "category_name": "Process", "owner_id": 1 + i % 100, "owner_name": f"User {i % 100}",
+        "status": "Submitted", "score": float(i % 7), "created_at": now - timedelta(minutes=i),
+        "votes": i % 11, "upvotes": i % 9, "downvotes": i % 2, "comments_count": i % 13,
+        "version": 1, "eval_count": i % 3, "eval_score": 6.5,
+    }
+
+
+def comment_item(i: int, now: datetime) -> dict:
+    return {
+        "id": i, "idea_id": 1, "user_id": 1 + i % 100, "user_name": f"User {i % 100}",
+        "content": "Agreed, and the notes should go in the channel afterwards. " * 2,
+        "created_at": now + timedelta(seconds=i),
+    }
+
+
+def _run(coro):
+    # serialize_response never suspends when is_coroutine=True
+    try:
+        coro.send(None)
+    except StopIteration as done:
+        return done.value
+    raise RuntimeError("serialize_response suspended")
+
+
+_fields = {}
+
+
+def old_path(tp, items) -> bytes:
+    # FastAPI builds the response field once, when the route is registered
+    field = _fields.get(tp) or _fields.setdefault(tp, create_response_field(name="response", type_=tp))
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        validated = parse_obj_as(tp, items)
+    content = _run(serialize_response(field=field, response_content=validated))
+    return JSONResponse(content).body
+
+
+def new_path(tp, items) -> bytes:
+    return encode(tp, items)
+
+
+def per_item_us(fn, tp, items, seconds: float) -> float:
+    fn(tp, items)  # warm-up (builds cached adapters)
+    runs, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        fn(tp, items)
+        runs += 1
+    return (time.perf_counter() - start) / runs / len(items) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[50, 500], help="items per page")
+    parser.add_argument("--seconds", type=float, default=1.0, help="time spent per measurement")
+    args = parser.parse_args()
+
+    now = datetime.utcnow()
+    payloads = (
+        ("ideas", List[schemas.IdeaOut], idea_item),
+        ("comments", List[schemas.CommentOut], comment_item),
+    )
+    print(f"{'payload':<10}{'items':>7}{'old us/item':>14}{'new us/item':>14}{'speed-up':>10}")
+    for name, tp, make in payloads:
+        for n in args.pages:
+            items = [make(i, now) for i in range(n)]
+            assert len(new_path(tp, items)) > 0
+            old = per_item_us(old_path, tp, items, args.seconds)
+            new = per_item_us(new_path, tp, items, args.seconds)
+            print(f"{name:<10}{n:>7}{old:>14.2f}{new:>14.2f}{old / new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
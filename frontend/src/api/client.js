@@ -13,4 +13,7 @@ API.interceptors.request.use((config) => {
   return config
 })
 
+// EventSource can't go through axios; build the absolute URL of an SSE endpoint
+export const eventsUrl = (path) => `${API.defaults.baseURL}${path}`
+
 export default API
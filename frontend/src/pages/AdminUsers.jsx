@@ -6,6 +6,8 @@ import { useAuth } from '../context/AuthContext'
 export default function AdminUsers() {
   const [users, setUsers] = useState([])
   const [loading, setLoading] = useState(false)
+  const [nextCursor, setNextCursor] = useState(null)
+  const [filters, setFilters] = useState({ role: '', name: '', email: '' })
   const [editing, setEditing] = useState(null) 
   const [rolesInput, setRolesInput] = useState('')
   const [error, setError] = useState(null)
@@ -20,12 +22,18 @@ export default function AdminUsers() {
     load()
   }, [user])
 
-  const load = async () => {
+  // first page for the current filters, or the next page when `cursor` is given
+  const load = async (cursor = null) => {
     setLoading(true)
     setError(null)
     try {
-      const res = await API.get('/api/admin/users/')
-      setUsers(res.data || [])
+      const params = { limit: 50 }
+      Object.entries(filters).forEach(([k, v]) => { if (v.trim()) params[k] = v.trim() })
+      if (cursor) params.cursor = cursor
+      const res = await API.get('/api/admin/users', { params })
+      const page = res.data || []
+      setUsers(prev => (cursor ? [...prev, ...page] : page))
+      setNextCursor(res.headers?.['x-next-cursor'] || null)
     } catch (e) {
       console.error('Could not load users', e)
       setError(e?.response?.data?.detail || e.message || 'Failed to load users')
@@ -99,9 +107,38 @@ export default function AdminUsers() {
         </div>
       </div>
 
+      <form
+        onSubmit={e => { e.preventDefault(); load() }}
+        className="mb-4 flex flex-wrap gap-2 items-center"
+      >
+        <select
+          value={filters.role}
+          onChange={e => setFilters(f => ({ ...f, role: e.target.value }))}
+          className="p-2 border rounded text-sm"
+        >
+          <option value="">All roles</option>
+          <option value="user">user</option>
+          <option value="evaluator">evaluator</option>
+          <option value="admin">admin</option>
+        </select>
+        <input
+          value={filters.name}
+          onChange={e => setFilters(f => ({ ...f, name: e.target.value }))}
+          className="p-2 border rounded text-sm flex-1"
+          placeholder="Name contains"
+        />
+        <input
+          value={filters.email}
+          onChange={e => setFilters(f => ({ ...f, email: e.target.value }))}
+          className="p-2 border rounded text-sm flex-1"
+          placeholder="Email starts with"
+        />
+        <button type="submit" className="px-3 py-2 bg-gray-600 text-white rounded text-sm">Search</button>
+      </form>
+
       <div className="mb-4">
         {error && <div className="text-red-600 mb-2">{error}</div>}
-        {loading ? (
+        {loading && users.length === 0 ? (
           <div className="py-6 text-center text-gray-500">Loading users…</div>
         ) : users.length === 0 ? (
           <div className="py-6 text-center text-gray-500">No users found.</div>
@@ -130,6 +167,15 @@ export default function AdminUsers() {
                 </div>
               </div>
             ))}
+            {nextCursor && (
+              <button
+                onClick={() => load(nextCursor)}
+                disabled={loading}
+                className="w-full py-2 text-sm rounded border bg-white"
+              >
+                {loading ? 'Loading…' : 'Load more'}
+              </button>
+            )}
           </div>
         )}
       </div>
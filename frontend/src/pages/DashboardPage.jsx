@@ -77,8 +77,8 @@ export default function DashboardPage() {
 
     try {
       // call backend to update status
-      // endpoint assumed POST /api/ideas/{id}/status with body { status: "Approved" }
-      await API.post(`/api/ideas/${cardId}/status`, { status: to })
+      // send the version we rendered so a card someone else moved meanwhile is rejected (409)
+      await API.post(`/api/ideas/${cardId}/status`, { status: to, version: movedCard.version })
       // reload to get authoritative data (optional)
       load()
     } catch (err) {
@@ -1,13 +1,13 @@
-import React from 'react'
+import React, { useEffect, useState } from 'react'
 import KanbanBoard from '../components/KanbanBoard'
 import API from '../api/client'
 
-const STATUSES = ["Submitted","Under Review", "Approved","In Progress","implemented", "Archived"]
+const STATUSES = ["Submitted","Under Review", "Approved","In Progress","Implemented", "Archived"]
 
 export default function EvaluatorDashboard(){
     const [columns,setColumns] = useState({})
 
-    useEffect(()=> loadConfigFromFile(), [])
+    useEffect(()=> { load() }, [])
 
     const load = async ()=> {
         try{
@@ -26,14 +26,17 @@ export default function EvaluatorDashboard(){
         }
     }
     const onDragEnd = async(result)=>{
-        const { destination, dgraggableId } = result
-        if(!destination) return
+        const { source, destination, draggableId } = result
+        if(!destination || destination.droppableId === source.droppableId) return
         const to = destination.droppableId
+        const card = (columns[source.droppableId] || []).find(c => String(c.id) === draggableId) || {}
         try {
-            await API.post(`/api/ideas/${draggableId}/status`, {status:to})
+            // the version we rendered; a card someone else moved meanwhile is rejected (409)
+            await API.post(`/api/ideas/${draggableId}/status`, {status:to, version: card.version})
             load()
         }catch(e) {
-            alert('Could not change status:' + (e.response?.data?.detail || e.message))
+            alert('Could not change status:' + (e.response?.data?.detail?.message || e.response?.data?.detail || e.message))
+            load()
         }
     }
     return (
@@ -1,7 +1,7 @@
 // src/pages/HomePage.jsx
 import React, { useCallback, useEffect, useMemo, useState } from 'react'
 import { useNavigate } from 'react-router-dom'
-import API from '../api/client'
+import API, { eventsUrl } from '../api/client'
 import IdeaList from '../components/IdeaList' // unchanged: expects ideas + onLike
 
 function IconList() {
@@ -211,10 +211,22 @@ export default function HomePage() {
     }
   }, [fetchCategories, fetchIdeas])
 
+  // new ideas appear without a reload
+  useEffect(() => {
+    const source = new EventSource(eventsUrl('/api/ideas/events'))
+    source.addEventListener('idea', (e) => {
+      const idea = JSON.parse(e.data)
+      if (selected != null && idea.category_id !== selected) return
+      setIdeas(prev => (prev.some(i => i.id === idea.id) ? prev : [idea, ...prev]))
+    })
+    return () => source.close()
+  }, [selected])
+
 const handleLike = async (id) => {
     try {
-      await API.post(`/api/ideas/${id}/vote`, { type: 'up' })
-      fetchIdeas(selected)
+      const res = await API.post(`/api/ideas/${id}/vote`, { type: 'up' })
+      const { votes: upvotes, downs: downvotes, score } = res.data
+      setIdeas(prev => prev.map(i => (i.id === id ? { ...i, upvotes, downvotes, votes: upvotes + downvotes, score } : i)))
     } catch (e) {
       console.error('Vote error', e.response || e)
       if (e.response?.status === 401) {
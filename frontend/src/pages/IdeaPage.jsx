@@ -1,6 +1,6 @@
 import React, { useEffect, useRef, useState } from 'react'
 import { useParams, Link, useNavigate } from 'react-router-dom'
-import API from '../api/client'
+import API, { eventsUrl } from '../api/client'
 import { useAuth } from '../context/AuthContext'
 
 const MAX_COMMENT_LENGTH = 1000
@@ -17,6 +17,8 @@ export default function IdeaPage() {
   const [posting, setPosting] = useState(false)
   const [voting, setVoting] = useState(false)
   const [error, setError] = useState(null)
+  const [related, setRelated] = useState([])
+  const [olderCursor, setOlderCursor] = useState(null)
 
   const commentsContainerRef = useRef(null)
   const textareaRef = useRef(null)
@@ -25,6 +27,17 @@ export default function IdeaPage() {
     try { return s ? new Date(s).toLocaleString() : '' } catch { return '' }
   }
 
+  useEffect(() => {
+    let mounted = true
+    API.get(`/api/ideas/${id}/related`, { params: { k: 3 } })
+      .then((res) => { if (mounted) setRelated(res.data || []) })
+      .catch((err) => {
+        console.error('Failed to load related ideas', err)
+        if (mounted) setRelated([])
+      })
+    return () => { mounted = false }
+  }, [id])
+
   useEffect(() => {
     let mounted = true
     async function loadAll() {
@@ -33,9 +46,12 @@ export default function IdeaPage() {
       try {
         const ideaRes = await API.get(`/api/ideas/${id}`)
         let commentsRes = []
+        let cursor = null
         try {
-          const cRes = await API.get(`/api/ideas/${id}/comments`)
+          // newest first, one page at a time
+          const cRes = await API.get(`/api/ideas/${id}/comments`, { params: { order: 'desc', limit: 50 } })
           commentsRes = cRes.data || []
+          cursor = cRes.headers?.['x-next-cursor'] || null
         } catch (err) {
           if (err?.response?.status === 404) {
             commentsRes = []
@@ -46,7 +62,8 @@ export default function IdeaPage() {
 
         if (!mounted) return
         setIdea(ideaRes.data || null)
-        setComments((commentsRes || []).slice().reverse())
+        setComments(commentsRes || [])
+        setOlderCursor(cursor)
       } catch (err) {
         console.error('Failed to load idea or comments', err)
         if (!mounted) return
@@ -61,6 +78,31 @@ export default function IdeaPage() {
     return () => { mounted = false }
   }, [id])
 
+  // live vote counts and comments from other users
+  useEffect(() => {
+    const source = new EventSource(eventsUrl(`/api/ideas/${id}/events`))
+    source.addEventListener('vote', (e) => {
+      const counts = JSON.parse(e.data)
+      setIdea(prev => (prev ? { ...prev, ...counts } : prev))
+    })
+    source.addEventListener('comment', (e) => {
+      const comment = JSON.parse(e.data)
+      setComments(prev => (prev.some(c => c.id === comment.id) ? prev : [comment, ...prev]))
+    })
+    return () => source.close()
+  }, [id])
+
+  const loadOlderComments = async () => {
+    if (!olderCursor) return
+    try {
+      const res = await API.get(`/api/ideas/${id}/comments`, { params: { order: 'desc', limit: 50, cursor: olderCursor } })
+      setComments(prev => [...prev, ...(res.data || [])])
+      setOlderCursor(res.headers?.['x-next-cursor'] || null)
+    } catch (err) {
+      console.error('Failed to load older comments', err)
+    }
+  }
+
   const scrollCommentsToTop = () => {
     try {
       if (commentsContainerRef.current) {
@@ -94,12 +136,23 @@ export default function IdeaPage() {
     try {
       const res = await API.post(`/api/ideas/${id}/comments`, { content })
       if (res?.data?.id) {
-        // replace temp with server comment
-        setComments(prev => prev.map(c => (String(c.id) === tempId ? res.data : c)))
+        // replace temp with server comment, unless the live event already added it
+        setComments(prev => (prev.some(c => c.id === res.data.id)
+          ? prev.filter(c => String(c.id) !== tempId)
+          : prev.map(c => (String(c.id) === tempId ? res.data : c))))
       } else {
-        // fallback: reload comments
-        const cRes = await API.get(`/api/ideas/${id}/comments`)
-        setComments((cRes.data || []).slice().reverse())
+        // fallback: fetch only what was posted after the newest comment we have
+        const newest = comments.find(c => !c.optimistic)
+        const params = newest ? { after: newest.id, limit: 200 } : { order: 'desc', limit: 50 }
+        const cRes = await API.get(`/api/ideas/${id}/comments`, { params })
+        if (newest) {
+          // `after` returns oldest first; the list shows newest first
+          const fresh = (cRes.data || []).slice().reverse()
+          const freshIds = new Set(fresh.map(c => c.id))
+          setComments(prev => [...fresh, ...prev.filter(c => String(c.id) !== tempId && !freshIds.has(c.id))])
+        } else {
+          setComments(cRes.data || [])
+        }
       }
     } catch (err) {
       console.error('Comment post failed', err)
@@ -133,10 +186,10 @@ export default function IdeaPage() {
       // optimistic increment
       const optimistic = { ...idea, score: (idea?.score ?? 0) + 1 }
       setIdea(optimistic)
-      await API.post(`/api/ideas/${id}/vote`, { type: 'up' })
-      // authoritative reload
-      const res = await API.get(`/api/ideas/${id}`)
-      setIdea(res.data)
+      const res = await API.post(`/api/ideas/${id}/vote`, { type: 'up' })
+      // the vote response carries the authoritative counts (`votes` is upvotes there)
+      const { votes: upvotes, downs: downvotes, score } = res.data
+      setIdea(cur => ({ ...cur, upvotes, downvotes, votes: upvotes + downvotes, score }))
     } catch (err) {
       console.error('Vote failed', err)
       alert(err?.response?.data?.detail || 'Failed to like')
@@ -235,7 +288,7 @@ export default function IdeaPage() {
 
           {/* Comments section */}
           <section className="mb-20">
-            <h3 className="text-lg font-semibold mb-3">Comments ({comments.length})</h3>
+            <h3 className="text-lg font-semibold mb-3">Comments ({Math.max(idea.comments_count || 0, comments.length)})</h3>
 
             {comments.length === 0 ? (
               <div className="text-gray-500 mb-4">No comments yet — be the first to comment.</div>
@@ -250,6 +303,11 @@ export default function IdeaPage() {
                     <div className="text-sm text-gray-700 mt-1 whitespace-pre-wrap">{c.content}</div>
                   </div>
                 ))}
+                {olderCursor && (
+                  <button onClick={loadOlderComments} className="text-sm text-gray-600 hover:underline">
+                    Load older comments
+                  </button>
+                )}
               </div>
             )}
           </section>
@@ -270,10 +328,12 @@ export default function IdeaPage() {
             <div className="bg-white p-4 rounded shadow-sm">
               <div className="text-sm text-gray-500">Related</div>
               <div className="mt-3 text-sm text-gray-700">
-                {/* placeholder related ideas — hook up when /api/ideas?related available */}
-                <div className="mb-2">— Related idea A</div>
-                <div className="mb-2">— Related idea B</div>
-                <div className="mb-2">— Related idea C</div>
+                {related.length === 0 && <div className="text-gray-500">No related ideas yet</div>}
+                {related.map((r) => (
+                  <div key={r.id} className="mb-2">
+                    — <Link to={`/ideas/${r.id}`} className="hover:underline">{r.title}</Link>
+                  </div>
+                ))}
               </div>
             </div>
           </div>